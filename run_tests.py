@@ -195,6 +195,9 @@ Examples:
     # Add execution options
     if args.fast:
         cmd.extend(['-m', 'not slow'])
+    else:
+        # Bare pytest runs skip slow tests (reported as skipped); the runner keeps including them
+        cmd.append('--slow')
     
     if args.verbose:
         cmd.append('-v')
@@ -202,7 +205,8 @@ Examples:
         cmd.append('-q')
     
     if args.parallel:
-        cmd.extend(['-n', 'auto'])
+        # Keep each file on one worker so module-scoped fixtures are built once
+        cmd.extend(['-n', 'auto', '--dist', 'loadfile'])
     
     # Add traceback option
     cmd.extend(['--tb', args.tb])
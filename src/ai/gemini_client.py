@@ -7,14 +7,19 @@ Handles communication with Google's Gemini AI for generating insights.
 
 import json
 import logging
+import threading
+import time
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, date
 from dataclasses import dataclass
 
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from tenacity import retry, stop_after_attempt, wait_exponential
-from jsonschema import validate, ValidationError
+from jsonschema import Draft7Validator, ValidationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..utils.config import get_config
 from ..storage import get_storage_adapter
@@ -72,6 +77,22 @@ Analyze the provided video data and return a JSON object with:
 - details: Object with specific suggestions (e.g., suggested_title, suggested_tags, etc.)
 
 Focus on specific, actionable recommendations for this video.
+"""
+    
+    VIDEO_BATCH_INSIGHTS_SYSTEM = """
+You are an expert YouTube analytics assistant. Your task is to analyze the performance of several videos and provide optimization recommendations for each one.
+
+You MUST respond with valid JSON only. Do not include any explanatory text before or after the JSON.
+
+Analyze each video in the provided list and return a JSON array with exactly one object per video, in the same order. Each object must include:
+- video_id: The video_id of the video being analyzed
+- action_type: One of ["recommend_reindex", "suggest_title_change", "suggest_description_optimization", "flag_low_retention", "recommend_promotion", "suggest_tags_update"]
+- priority: One of ["high", "medium", "low"]
+- confidence: A number between 0 and 1
+- rationale: A brief explanation (1-2 sentences)
+- details: Object with specific suggestions (e.g., suggested_title, suggested_tags, etc.)
+
+Focus on specific, actionable recommendations for each video.
 """
     
     @staticmethod
@@ -92,6 +113,17 @@ Video Performance Data:
 {json.dumps(video_data, indent=2, default=str)}
 
 Task: Analyze this video's performance and provide specific optimization recommendations. Return JSON only.
+"""
+    
+    @staticmethod
+    def format_video_batch_prompt(videos_data: List[Dict[str, Any]]) -> str:
+        """Format several videos' data for a single Gemini prompt."""
+        numbered = [{"index": idx + 1, **video_data} for idx, video_data in enumerate(videos_data)]
+        return f"""
+Videos Performance Data ({len(videos_data)} videos):
+{json.dumps(numbered, indent=2, default=str)}
+
+Task: Analyze each video's performance and provide specific optimization recommendations. Return a JSON array with one object per video. Return JSON only.
 """
 
 class GeminiSchemas:
@@ -165,23 +197,81 @@ class GeminiSchemas:
         },
         "required": ["action_type", "priority", "confidence", "rationale", "details"]
     }
+    
+    VIDEO_BATCH_INSIGHTS_SCHEMA = {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "video_id": {
+                    "type": "string"
+                },
+                **VIDEO_INSIGHTS_SCHEMA["properties"]
+            },
+            "required": ["video_id"] + VIDEO_INSIGHTS_SCHEMA["required"]
+        },
+        "minItems": 1
+    }
+
+# google.generativeai takes about half a second to import, so it is loaded by
+# the first GeminiClient rather than by every importer of this module
+genai = None
+
+def _load_genai():
+    """Import the Gemini SDK on first use and bind it to the module."""
+    global genai
+    if genai is None:
+        import google.generativeai as genai
+    return genai
+
+def _loads(text: str) -> Any:
+    """Parse JSON with orjson when installed, falling back to the stdlib."""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Compiled once at import; Draft7Validator.validate skips the per-call schema check
+Draft7Validator.check_schema(GeminiSchemas.CHANNEL_INSIGHTS_SCHEMA)
+Draft7Validator.check_schema(GeminiSchemas.VIDEO_INSIGHTS_SCHEMA)
+Draft7Validator.check_schema(GeminiSchemas.VIDEO_BATCH_INSIGHTS_SCHEMA)
+_CHANNEL_VALIDATOR = Draft7Validator(GeminiSchemas.CHANNEL_INSIGHTS_SCHEMA)
+_VIDEO_VALIDATOR = Draft7Validator(GeminiSchemas.VIDEO_INSIGHTS_SCHEMA)
+_VIDEO_BATCH_VALIDATOR = Draft7Validator(GeminiSchemas.VIDEO_BATCH_INSIGHTS_SCHEMA)
+
+# Videos packed into a single Gemini prompt; callers of generate_insights_for_videos batch by this
+VIDEO_BATCH_SIZE = 5
 
 class GeminiClient:
     """Client for interacting with Gemini AI."""
     
-    def __init__(self):
-        self.config = get_config()
+    def __init__(self, config=None, db_session=None):
+        self.config = config if config is not None else get_config()
+        # An injected session is owned by the caller; otherwise one is opened per save
+        self.db_session = db_session
         self._configure_gemini()
         self.tokens_used = 0
+        # Bulk runs share one client across worker threads
+        self._tokens_lock = threading.Lock()
+        
+        # Imported here so importing this module doesn't pull in streamlit
+        from ..utils.optimization import RateLimiter
+        self._rate_limiter = RateLimiter(
+            requests_per_window=self.config.gemini_api_rate_limit,
+            window_seconds=60
+        )
         
     def _configure_gemini(self):
         """Configure Gemini AI client."""
         if not self.config.gemini_api_key or self.config.gemini_api_key == "your_gemini_api_key_here":
             raise ValueError("Gemini API key is not configured. Please set GEMINI_API_KEY in your environment variables.")
         
+        _load_genai()
         genai.configure(api_key=self.config.gemini_api_key)
         
         # Configure safety settings
+        HarmCategory = genai.types.HarmCategory
+        HarmBlockThreshold = genai.types.HarmBlockThreshold
         self.safety_settings = {
             HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
             HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
@@ -201,6 +291,8 @@ class GeminiClient:
     )
     def _generate_content(self, prompt: str) -> str:
         """Generate content with retry logic."""
+        # Every attempt, retries included, counts against the per-minute limit
+        self._wait_for_rate_limit()
         try:
             response = self.model.generate_content(
                 prompt,
@@ -213,7 +305,8 @@ class GeminiClient:
             )
             
             # Track token usage (approximate)
-            self.tokens_used += len(prompt.split()) + len(response.text.split())
+            with self._tokens_lock:
+                self.tokens_used += len(prompt.split()) + len(response.text.split())
             
             return response.text.strip()
             
@@ -221,7 +314,12 @@ class GeminiClient:
             logger.error(f"Error generating content: {e}")
             raise
     
-    def _validate_response(self, response_text: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def _wait_for_rate_limit(self) -> None:
+        """Block until the configured Gemini rate limit allows another request."""
+        while not self._rate_limiter.acquire():
+            time.sleep(self._rate_limiter.wait_time())
+    
+    def _validate_response(self, response_text: str, validator: Draft7Validator) -> Dict[str, Any]:
         """Validate and parse Gemini response."""
         try:
             # Clean response text (remove markdown formatting if present)
@@ -233,10 +331,10 @@ class GeminiClient:
             cleaned_text = cleaned_text.strip()
             
             # Parse JSON
-            parsed_response = json.loads(cleaned_text)
+            parsed_response = _loads(cleaned_text)
             
             # Validate against schema
-            validate(instance=parsed_response, schema=schema)
+            validator.validate(parsed_response)
             
             return parsed_response
             
@@ -262,7 +360,7 @@ class GeminiClient:
             # Validate and parse response
             parsed_insights = self._validate_response(
                 response_text, 
-                GeminiSchemas.CHANNEL_INSIGHTS_SCHEMA
+                _CHANNEL_VALIDATOR
             )
             
             insights = parsed_insights if isinstance(parsed_insights, list) else [parsed_insights]
@@ -303,7 +401,7 @@ class GeminiClient:
             # Validate and parse response
             parsed_insight = self._validate_response(
                 response_text,
-                GeminiSchemas.VIDEO_INSIGHTS_SCHEMA
+                _VIDEO_VALIDATOR
             )
             
             insights = [parsed_insight]
@@ -327,9 +425,52 @@ class GeminiClient:
                 tokens_used=self.tokens_used
             )
     
+    def generate_video_insights_batch(self, videos_data: List[Dict[str, Any]]) -> List[InsightResponse]:
+        """Generate video-level insights for several videos with one request."""
+        try:
+            # Format prompt
+            system_prompt = GeminiPromptTemplates.VIDEO_BATCH_INSIGHTS_SYSTEM
+            user_prompt = GeminiPromptTemplates.format_video_batch_prompt(videos_data)
+            full_prompt = f"{system_prompt}\n\n{user_prompt}"
+            
+            # Generate response
+            response_text = self._generate_content(full_prompt)
+            
+            # Validate and parse response
+            parsed_insights = self._validate_response(
+                response_text,
+                _VIDEO_BATCH_VALIDATOR
+            )
+            
+        except Exception as e:
+            error_msg = f"Error generating video insights: {e}"
+            logger.error(error_msg)
+            
+            return [
+                InsightResponse(success=False, insights=[], errors=[error_msg], tokens_used=self.tokens_used)
+                for _ in videos_data
+            ]
+        
+        insights_by_video: Dict[str, List[Dict[str, Any]]] = {}
+        for insight in parsed_insights:
+            insights_by_video.setdefault(insight.pop("video_id"), []).append(insight)
+        
+        responses = []
+        for video_data in videos_data:
+            insights = insights_by_video.get(video_data["video_id"], [])
+            errors = [] if insights else [f"No insights returned for video {video_data['video_id']}"]
+            responses.append(InsightResponse(
+                success=bool(insights),
+                insights=insights,
+                errors=errors,
+                tokens_used=self.tokens_used
+            ))
+        
+        return responses
+    
     def save_insights_to_db(self, insights: List[Dict[str, Any]], channel_id: str, video_id: Optional[str] = None) -> int:
         """Save insights to database."""
-        session = get_db_session()
+        session = self.db_session if self.db_session is not None else get_db_session()
         saved_count = 0
         
         try:
@@ -359,7 +500,8 @@ class GeminiClient:
             logger.error(f"Error saving insights to database: {e}")
             raise
         finally:
-            session.close()
+            if session is not self.db_session:
+                session.close()
 
 class InsightGenerator:
     """High-level insight generation orchestrator."""
@@ -402,6 +544,25 @@ class InsightGenerator:
         
         return response
 
+    def generate_insights_for_videos(self, videos_data: List[Dict[str, Any]]) -> List[InsightResponse]:
+        """Generate and save insights for one batch of at most VIDEO_BATCH_SIZE videos in one prompt."""
+        responses = self.gemini_client.generate_video_insights_batch(videos_data)
+        
+        for video_data, response in zip(videos_data, responses):
+            if response.success and response.insights:
+                try:
+                    saved_count = self.gemini_client.save_insights_to_db(
+                        response.insights,
+                        video_data["channel_id"],
+                        video_data["video_id"]
+                    )
+                    logger.info(f"Saved {saved_count} video insights to database")
+                except Exception as e:
+                    response.errors.append(f"Error saving insights: {e}")
+                    response.success = False
+        
+        return responses
+
 # Global insight generator
 _insight_generator: Optional[InsightGenerator] = None
 
@@ -26,11 +26,66 @@ def create_database():
     try:
         db_manager = init_database(config.database_url)
         print("✅ Database tables created successfully!")
+        create_search_index(db_manager)
         return db_manager
     except Exception as e:
         print(f"❌ Error creating database: {e}")
         sys.exit(1)
 
+def create_search_index(db_manager):
+    """Create the full-text search index used by the videos page search."""
+    dialect = db_manager.engine.dialect.name
+    
+    with db_manager.engine.begin() as conn:
+        if dialect == "sqlite":
+            # FTS5 table keeping its own copy of the text plus video_id, kept in
+            # sync by triggers. It is not an external-content table: those join on
+            # the implicit rowid of videos, which VACUUM may renumber because the
+            # primary key is a string. Rebuilt from scratch so older layouts migrate
+            for trigger in ("videos_fts_insert", "videos_fts_delete", "videos_fts_update"):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            conn.execute(text("DROP TABLE IF EXISTS videos_fts"))
+            conn.execute(text("""
+                CREATE VIRTUAL TABLE videos_fts USING fts5(
+                    video_id UNINDEXED, title, description
+                )
+            """))
+            conn.execute(text("""
+                CREATE TRIGGER videos_fts_insert AFTER INSERT ON videos BEGIN
+                    INSERT INTO videos_fts(video_id, title, description)
+                    VALUES (new.video_id, new.title, new.description);
+                END
+            """))
+            conn.execute(text("""
+                CREATE TRIGGER videos_fts_delete AFTER DELETE ON videos BEGIN
+                    DELETE FROM videos_fts WHERE video_id = old.video_id;
+                END
+            """))
+            # Only text edits touch the index; metric refreshes leave it alone
+            conn.execute(text("""
+                CREATE TRIGGER videos_fts_update AFTER UPDATE OF video_id, title, description ON videos BEGIN
+                    DELETE FROM videos_fts WHERE video_id = old.video_id;
+                    INSERT INTO videos_fts(video_id, title, description)
+                    VALUES (new.video_id, new.title, new.description);
+                END
+            """))
+            # Index any rows that existed before the triggers
+            conn.execute(text("""
+                INSERT INTO videos_fts(video_id, title, description)
+                SELECT video_id, title, description FROM videos
+            """))
+        elif dialect == "postgresql":
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS videos_trgm ON videos
+                USING gin ((title || ' ' || COALESCE(description, '')) gin_trgm_ops)
+            """))
+        else:
+            print(f"Skipping search index: unsupported database '{dialect}'")
+            return
+    
+    print("✅ Search index created successfully!")
+
 def load_sample_data():
     """Load sample data for testing."""
     print("Loading sample data...")
@@ -277,6 +332,7 @@ def reset_database():
     
     # Recreate tables
     Base.metadata.create_all(bind=db_manager.engine)
+    create_search_index(db_manager)
     
     print("✅ Database reset successfully!")
 
@@ -15,6 +15,7 @@ from ..ingestion.youtube_data import get_ingester
 from ..ai.gemini_client import get_insight_generator
 from ..auth.youtube_auth import get_authenticator
 from ..database.models import get_db_session, Video, VideoMetrics
+from .videos import invalidate_videos_cache
 import numpy as np
 
 def convert_numpy_types(obj):
@@ -386,6 +387,7 @@ def handle_data_refresh():
                 
                 # Clear cache to show updated data
                 st.cache_data.clear()
+                invalidate_videos_cache()
                 return True
             else:
                 st.error(f"❌ Data refresh failed: {'; '.join(result.errors)}")
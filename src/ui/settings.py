@@ -15,6 +15,7 @@ from ..utils.config import get_config
 from ..storage import get_storage_adapter
 from ..ingestion.youtube_data import get_ingester
 from ..database.models import DatabaseManager
+from .videos import invalidate_videos_cache
 
 def render_youtube_auth_section():
     """Render YouTube authentication section."""
@@ -298,6 +299,7 @@ def render_data_ingestion_section():
                         result = ingester.ingest_channel_data(date_range_days=date_range_days)
                         
                         if result.success:
+                            invalidate_videos_cache()
                             st.success(f"✅ Data refreshed successfully!")
                             st.info(f"📊 Processed {result.videos_processed} videos and saved {result.metrics_saved} metrics")
                             
@@ -357,6 +359,7 @@ def render_app_settings_section():
     with col1:
         if st.button("🗑️ Clear All Caches"):
             st.cache_data.clear()
+            invalidate_videos_cache()
             st.success("✅ All caches cleared!")
     
     with col2:
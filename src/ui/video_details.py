@@ -8,12 +8,17 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta, date
+from itertools import islice
 from typing import Dict, Any, Optional, List
 
 from ..storage import get_storage_adapter
 from ..ai.gemini_client import get_insight_generator
 from ..auth.youtube_auth import get_authenticator
 from ..database.models import get_db_session, Video, VideoMetrics, Insight
+from .videos import invalidate_videos_cache
+
+# Number of insights rendered per "load more" step
+INSIGHTS_PAGE_SIZE = 10
 
 def format_number(num: float) -> str:
     """Format numbers for display."""
@@ -106,17 +111,18 @@ def get_video_metrics_timeseries(video_id: str, start_date: date, end_date: date
         session.close()
 
 @st.cache_data(ttl=300)
-def get_video_insights(video_id: str) -> List[Dict[str, Any]]:
-    """Get insights for a specific video."""
+def get_video_insights(video_id: str, offset: int = 0, limit: int = INSIGHTS_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """Get a page of insights for a specific video, newest first."""
     session = get_db_session()
     
     try:
+        # Stream rows in batches and only materialize the requested window
         insights = session.query(Insight).filter(
             Insight.video_id == video_id
-        ).order_by(Insight.created_at.desc()).all()
+        ).order_by(Insight.created_at.desc()).yield_per(100)
         
         insights_data = []
-        for insight in insights:
+        for insight in islice(insights, offset, offset + limit):
             insights_data.append({
                 'id': insight.id,
                 'action_type': insight.action_type,
@@ -341,7 +347,7 @@ def render_time_series_charts(metrics_df: pd.DataFrame):
     
     st.plotly_chart(engagement_fig, use_container_width=True)
 
-def render_insights_section(video_id: str, insights: List[Dict[str, Any]]):
+def render_insights_section(video_id: str, insights: List[Dict[str, Any]], has_more: bool = False):
     """Render insights section with AI recommendations."""
     st.subheader("🤖 AI Insights & Recommendations")
     
@@ -388,6 +394,7 @@ def render_insights_section(video_id: str, insights: List[Dict[str, Any]]):
                             if response.success:
                                 st.success("✅ New insights generated!")
                                 st.cache_data.clear()
+                                invalidate_videos_cache()
                                 st.rerun()
                             else:
                                 st.error(f"❌ Failed to generate insights: {'; '.join(response.errors)}")
@@ -438,6 +445,12 @@ def render_insights_section(video_id: str, insights: List[Dict[str, Any]]):
                             st.write(f"**{key.replace('_', ' ').title()}:** {value}")
             
             st.divider()
+    
+    if has_more:
+        if st.button("⬇️ Load more insights", key=f"load_more_insights_{video_id}"):
+            offset_key = f"insights_offset_{video_id}"
+            st.session_state[offset_key] = st.session_state.get(offset_key, 0) + INSIGHTS_PAGE_SIZE
+            st.rerun()
 
 def render_video_details_page():
     """Render the video details page."""
@@ -517,7 +530,17 @@ def render_video_details_page():
     # Load metrics and insights
     with st.spinner("Loading video analytics..."):
         metrics_df = get_video_metrics_timeseries(video_id, start_date, end_date)
-        insights = get_video_insights(video_id)
+        
+        # Each page is fetched (and cached) separately; one extra row tells us whether more exist
+        insights_offset = st.session_state.get(f"insights_offset_{video_id}", 0)
+        insights = []
+        has_more = False
+        for page_offset in range(0, insights_offset + INSIGHTS_PAGE_SIZE, INSIGHTS_PAGE_SIZE):
+            page = get_video_insights(video_id, page_offset, INSIGHTS_PAGE_SIZE + 1)
+            has_more = len(page) > INSIGHTS_PAGE_SIZE
+            insights.extend(page[:INSIGHTS_PAGE_SIZE])
+            if not has_more:
+                break
     
     # Render metrics summary
     render_video_metrics_summary(metrics_df)
@@ -530,7 +553,7 @@ def render_video_details_page():
     st.divider()
     
     # Render insights section
-    render_insights_section(video_id, insights)
+    render_insights_section(video_id, insights, has_more)
 
 if __name__ == "__main__":
     render_video_details_page()
\ No newline at end of file
@@ -3,17 +3,27 @@
 Videos Table Page - Sortable and searchable table of all videos with metrics
 """
 
+import base64
+import time
 import streamlit as st
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from sqlalchemy import DateTime, TextClause, TextualSelect, bindparam, inspect, text
 from datetime import datetime, timedelta, date
 from typing import Dict, Any, Optional, List
 from PIL import Image
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from io import BytesIO
 
-from ..storage import get_storage_adapter
-from ..auth.youtube_auth import get_authenticator
-from ..ai.gemini_client import get_insight_generator
+try:
+    import diskcache
+except ImportError:  # Optional: thumbnails are then only cached in memory
+    diskcache = None
+
 from ..database.models import get_db_session
 
 def format_number(num: float) -> str:
@@ -38,30 +48,236 @@ def format_duration(seconds: float) -> str:
     else:
         return f"{seconds:.0f}s"
 
-def load_thumbnail(url: str, size: tuple = (120, 90)) -> Optional[Image.Image]:
-    """Load and resize thumbnail image."""
+def _format_number_series(values: pd.Series) -> np.ndarray:
+    """Vectorized equivalent of format_number for a whole column."""
+    values = values.fillna(0).to_numpy(dtype=np.float64)
+    out = np.empty(len(values), dtype='U16')
+    
+    # Each magnitude band is formatted once, only for the values that fall in it
+    mega = values >= 1_000_000
+    kilo = (values >= 1_000) & ~mega
+    small = ~(mega | kilo)
+    out[mega] = np.char.add(np.char.mod('%.1f', values[mega] / 1_000_000), 'M')
+    out[kilo] = np.char.add(np.char.mod('%.1f', values[kilo] / 1_000), 'K')
+    out[small] = np.char.mod('%.0f', values[small])
+    return out
+
+def _format_duration_series(seconds: pd.Series) -> np.ndarray:
+    """Vectorized equivalent of format_duration for a whole column."""
+    seconds = seconds.fillna(0).astype(float)
+    hours = (seconds // 3600).astype(int).astype(str)
+    hour_minutes = ((seconds % 3600) // 60).astype(int).astype(str)
+    minutes = (seconds // 60).astype(int).astype(str)
+    secs = (seconds % 60).astype(int).astype(str)
+    return np.where(
+        seconds >= 3600,
+        hours + "h " + hour_minutes + "m",
+        np.where(
+            seconds >= 60,
+            minutes + "m " + secs + "s",
+            seconds.round().astype(int).astype(str) + "s"
+        )
+    )
+
+def _add_display_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Precompute formatted display strings so row rendering only reads them."""
+    df = df.copy()
+    df['impressions_fmt'] = _format_number_series(df['total_impressions'])
+    df['views_fmt'] = _format_number_series(df['total_views'])
+    df['likes_fmt'] = _format_number_series(df['total_likes'])
+    df['ctr_fmt'] = df['ctr'].map('{:.2f}%'.format)
+    df['avg_duration_fmt'] = _format_duration_series(df['avg_view_duration'])
+    df['watch_time_fmt'] = _format_duration_series(df['total_watch_time'])
+    return df
+
+THUMBNAIL_SIZE = (120, 90)
+
+# Large YouTube thumbnail variants that can be swapped for the 320x180 "mqdefault" image
+_LARGE_THUMBNAIL_VARIANTS = ("maxresdefault", "sddefault", "hq720", "hqdefault")
+
+def _small_thumbnail_url(url: str) -> str:
+    """Rewrite a YouTube thumbnail URL to its medium-quality variant."""
+    for variant in _LARGE_THUMBNAIL_VARIANTS:
+        marker = f"/{variant}."
+        if marker in url:
+            return url.replace(marker, "/mqdefault.")
+    return url
+
+# Shared keep-alive session so a page of thumbnails reuses a few TLS connections
+_http_session = requests.Session()
+_http_session.mount(
+    'https://',
+    HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2))
+)
+
+# Resized thumbnails persisted across restarts; YouTube thumbnail URLs are stable per video
+THUMBNAIL_DISK_CACHE_DIR = ".thumb_cache"
+THUMBNAIL_DISK_CACHE_TTL = 30 * 86400
+
+@lru_cache(maxsize=1)
+def _thumbnail_disk_cache():
+    """Open the on-disk thumbnail cache, or None when diskcache isn't installed."""
+    if diskcache is None:
+        return None
+    return diskcache.Cache(THUMBNAIL_DISK_CACHE_DIR, size_limit=2**30)
+
+def _fetch_thumbnail(url: str, size: tuple = THUMBNAIL_SIZE) -> Optional[Image.Image]:
+    """Load a resized thumbnail from disk or download it (safe to call from worker threads)."""
+    disk_cache = _thumbnail_disk_cache()
+    key = (url, size)
+    
+    if disk_cache is not None:
+        data = disk_cache.get(key)
+        if data is not None:
+            img = Image.open(BytesIO(data))
+            img.load()
+            return img
+    
+    img = _download_thumbnail(url, size)
+    
+    if img is not None and disk_cache is not None:
+        buffer = BytesIO()
+        img.convert('RGB').save(buffer, 'JPEG', quality=80)
+        disk_cache.set(key, buffer.getvalue(), expire=THUMBNAIL_DISK_CACHE_TTL)
+    
+    return img
+
+def _download_thumbnail(url: str, size: tuple = THUMBNAIL_SIZE) -> Optional[Image.Image]:
+    """Download and resize a thumbnail image."""
     try:
-        response = requests.get(url, timeout=5)
+        response = _http_session.get(_small_thumbnail_url(url), timeout=5)
         if response.status_code == 200:
             img = Image.open(BytesIO(response.content))
-            img.thumbnail(size, Image.Resampling.LANCZOS)
+            if img.width > size[0] or img.height > size[1]:
+                # Let libjpeg downscale while decoding instead of decoding full size
+                img.draft('RGB', size)
+                img.thumbnail(size, Image.Resampling.BICUBIC)
+            else:
+                # Already small enough; just decode here rather than on first use
+                img.load()
             return img
     except Exception:
         pass
     return None
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_videos_data(start_date: date, end_date: date, search_term: str = "") -> pd.DataFrame:
-    """Get videos data with metrics for the specified date range."""
-    session = get_db_session()
+@st.cache_data(ttl=86400, max_entries=1024)  # Cache for 1 day
+def load_thumbnail(url: str, size: tuple = THUMBNAIL_SIZE) -> Optional[Image.Image]:
+    """Load and resize thumbnail image."""
+    return _fetch_thumbnail(url, size)
+
+@st.cache_data(ttl=86400, max_entries=1024)
+def thumbnail_data_uri(url: str, size: tuple = THUMBNAIL_SIZE) -> Optional[str]:
+    """Encode a cached thumbnail as a data URI for st.dataframe image columns."""
+    img = _thumbnail_cache().get((url, size))
+    if img is None:
+        img = _fetch_thumbnail(url, size)
+    if img is None:
+        return None
     
-    try:
-        # Base query for videos with their latest metrics
-        query = """
+    buffer = BytesIO()
+    img.convert('RGB').save(buffer, 'JPEG', quality=80)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+@st.cache_resource
+def _thumbnail_cache() -> Dict[tuple, Image.Image]:
+    """Process-wide store of decoded thumbnails keyed by (url, size)."""
+    return {}
+
+def prefetch_thumbnails(urls: List[str], size: tuple = THUMBNAIL_SIZE) -> None:
+    """Download missing thumbnails concurrently so a page's images load in one round."""
+    cache = _thumbnail_cache()
+    missing = [url for url in dict.fromkeys(urls) if url and (url, size) not in cache]
+    if not missing:
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+        images = executor.map(lambda url: _fetch_thumbnail(url, size), missing)
+        for url, img in zip(missing, images):
+            if img is not None:
+                cache[(url, size)] = img
+
+# Cached video queries are refreshed after this many seconds
+VIDEOS_CACHE_TTL = 300
+
+# Bumped whenever insights or data change so cached video queries are recomputed
+_cache_epoch = 0
+
+def invalidate_videos_cache() -> None:
+    """Invalidate all cached videos query results."""
+    global _cache_epoch
+    _cache_epoch += 1
+
+# Sortable columns exposed in the UI; ORDER BY is only ever built from this whitelist
+VIDEO_SORT_OPTIONS = {
+    "total_views": "Views",
+    "total_impressions": "Impressions",
+    "ctr": "CTR",
+    "avg_view_duration": "Avg Duration",
+    "total_watch_time": "Watch Time",
+    "total_likes": "Likes",
+    "total_comments": "Comments",
+    "published_at": "Published Date"
+}
+
+VIDEOS_PER_PAGE = 10
+# Characters shown for titles/descriptions in row layouts; SQL fetches one more to detect truncation
+TITLE_PREVIEW_CHARS = 60
+DESCRIPTION_PREVIEW_CHARS = 100
+
+# Search clause per backend; FTS and Postgres trigram indexes come from the migration script
+_SEARCH_CLAUSES = {
+    "fts": " AND v.video_id IN (SELECT video_id FROM videos_fts WHERE videos_fts MATCH :search)",
+    "postgresql": " AND (v.title || ' ' || COALESCE(v.description, '')) ILIKE :search",
+    "like": " AND (LOWER(v.title) LIKE :search OR LOWER(v.description) LIKE :search)"
+}
+
+# Binds already found to have the FTS table. A missing table is not remembered,
+# so an index created by the migration script is picked up without a restart
+_fts_binds = set()
+
+def _search_backend(bind) -> str:
+    """Pick the search clause the database supports."""
+    if bind.dialect.name == "sqlite":
+        if bind in _fts_binds:
+            return "fts"
+        if inspect(bind).has_table("videos_fts"):
+            _fts_binds.add(bind)
+            return "fts"
+    if bind.dialect.name == "postgresql":
+        return "postgresql"
+    return "like"
+
+def _fts_query(search_term: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    tokens = search_term.split()
+    return " ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+
+def _search_params(bind, search_term: str) -> tuple:
+    """Return the search backend (None when not searching) and its bound params."""
+    if not search_term or not search_term.strip():
+        return None, {}
+    
+    backend = _search_backend(bind)
+    if backend == "fts":
+        return backend, {'search': _fts_query(search_term)}
+    if backend == "postgresql":
+        return backend, {'search': f"%{search_term}%"}
+    return backend, {'search': f"%{search_term.lower()}%"}
+
+def _videos_query_sql(search_backend: Optional[str], preview: bool = False) -> str:
+    """Build the per-video aggregate query (without ORDER BY)."""
+    # Pages only show short previews, so don't ship the full description for them
+    text_columns = (
+        f"""v.title,
+            SUBSTR(v.title, 1, {TITLE_PREVIEW_CHARS + 1}) as title_short,
+            SUBSTR(v.description, 1, {DESCRIPTION_PREVIEW_CHARS + 1}) as desc_short"""
+        if preview else "v.title,\n            v.description"
+    )
+    # Insights are pre-aggregated so the join doesn't multiply metric rows
+    query = f"""
         SELECT 
             v.video_id,
-            v.title,
-            v.description,
+            {text_columns},
             v.published_at,
             v.thumbnail_url,
             v.channel_id,
@@ -78,87 +294,232 @@ def get_videos_data(start_date: date, end_date: date, search_term: str = "") ->
             COALESCE(SUM(vm.comments), 0) as total_comments,
             COALESCE(SUM(vm.shares), 0) as total_shares,
             COALESCE(SUM(vm.subscribers_gained), 0) as subscribers_gained,
-            MAX(i.created_at) as last_insight_timestamp,
-            COUNT(DISTINCT i.id) as insight_count
+            MAX(i.last_insight_timestamp) as last_insight_timestamp,
+            COALESCE(MAX(i.insight_count), 0) as insight_count
         FROM videos v
         LEFT JOIN video_metrics vm ON v.video_id = vm.video_id 
             AND vm.date BETWEEN :start_date AND :end_date
-        LEFT JOIN insights i ON v.video_id = i.video_id
+        LEFT JOIN (
+            SELECT video_id, MAX(created_at) as last_insight_timestamp, COUNT(*) as insight_count
+            FROM insights
+            WHERE video_id IS NOT NULL
+            GROUP BY video_id
+        ) i ON v.video_id = i.video_id
         WHERE 1=1
         """
-        
-        params = {
-            'start_date': start_date,
-            'end_date': end_date
-        }
-        
-        # Add search filter if provided
-        if search_term:
-            query += " AND (LOWER(v.title) LIKE :search OR LOWER(v.description) LIKE :search)"
-            params['search'] = f"%{search_term.lower()}%"
-        
-        query += """
+    
+    # Add search filter if provided
+    if search_backend:
+        query += _SEARCH_CLAUSES[search_backend]
+    
+    query += """
         GROUP BY v.video_id, v.title, v.description, v.published_at, v.thumbnail_url, v.channel_id
-        ORDER BY total_views DESC
         """
+    
+    return query
+
+# Statements are built once per query shape and reused, so neither the SQL
+# string nor the text() bind-parameter parsing is redone on every rerun
+@lru_cache(maxsize=128)
+def _videos_page_statement(search_backend: Optional[str], sort_by: str, direction: str,
+                           paged: bool, with_cursor: bool) -> TextualSelect:
+    """Get the compiled-once statement for a sorted (and optionally paged) videos query."""
+    query = _videos_query_sql(search_backend, preview=paged)
+    query = f"SELECT * FROM ({query}) videos_page"
+    
+    # Keyset pagination: seek past the last (sort value, video_id) of the previous page
+    if with_cursor:
+        comparison = "<" if direction == "DESC" else ">"
+        query += (
+            f" WHERE {sort_by} {comparison} :cursor_value"
+            f" OR ({sort_by} = :cursor_value AND video_id {comparison} :cursor_video_id)"
+        )
+    
+    # video_id keeps the order stable across pages when sort values tie
+    query += f" ORDER BY {sort_by} {direction}, video_id {direction}"
+    if paged:
+        query += " LIMIT :limit"
+    
+    # Typing published_at lets SQLAlchemy parse it while rows are fetched
+    statement = text(query).columns(published_at=DateTime)
+    if with_cursor and sort_by == "published_at":
+        # Bind the cursor in the same format the column is stored in
+        statement = statement.bindparams(bindparam('cursor_value', type_=DateTime))
+    
+    return statement
+
+@lru_cache(maxsize=8)
+def _videos_summary_statement(search_backend: Optional[str]) -> TextClause:
+    """Get the compiled-once statement for the videos summary aggregate."""
+    return text(f"""
+        SELECT 
+            COUNT(*) as total_videos,
+            COALESCE(SUM(total_views), 0) as total_views,
+            COALESCE(AVG(ctr), 0) as avg_ctr,
+            COALESCE(SUM(CASE WHEN insight_count > 0 THEN 1 ELSE 0 END), 0) as videos_with_insights
+        FROM ({_videos_query_sql(search_backend)}) videos_agg
+    """)
+
+@lru_cache(maxsize=64)
+def _query_videos_data(start_date: date, end_date: date, search_term: str,
+                       sort_by: str, sort_order: str, limit: Optional[int], cursor: Optional[tuple],
+                       epoch: int, ttl_bucket: int) -> pd.DataFrame:
+    """Run the videos page query. epoch and ttl_bucket only take part in the cache key."""
+    if sort_by not in VIDEO_SORT_OPTIONS:
+        raise ValueError(f"Unsupported sort column: {sort_by}")
+    direction = "DESC" if sort_order == "desc" else "ASC"
+    
+    session = get_db_session()
+    
+    try:
+        search_backend, params = _search_params(session.bind, search_term)
+        params.update({'start_date': start_date, 'end_date': end_date})
+        if cursor is not None:
+            params.update({'cursor_value': cursor[0], 'cursor_video_id': cursor[1]})
+        if limit is not None:
+            params['limit'] = limit
         
-        df = pd.read_sql(query, session.bind, params=params)
+        statement = _videos_page_statement(
+            search_backend, sort_by, direction,
+            paged=limit is not None,
+            with_cursor=cursor is not None
+        )
+        # Arrow-backed columns keep titles and descriptions out of Python objects
+        df = pd.read_sql(statement, session.bind, params=params, dtype_backend='pyarrow')
         
-        # Convert published_at to datetime if it's not already
         if not df.empty and 'published_at' in df.columns:
-            df['published_at'] = pd.to_datetime(df['published_at'])
             df['days_since_published'] = (datetime.now() - df['published_at']).dt.days
         
         return df
         
-    except Exception as e:
-        st.error(f"Error loading videos data: {e}")
-        return pd.DataFrame()
     finally:
         session.close()
 
-def get_video_insights_count(video_id: str) -> int:
-    """Get the number of insights for a specific video."""
+@lru_cache(maxsize=64)
+def _query_videos_summary(start_date: date, end_date: date, search_term: str,
+                          epoch: int, ttl_bucket: int) -> Dict[str, Any]:
+    """Aggregate summary stats over all videos matching the filters in one query."""
     session = get_db_session()
     
     try:
-        count = session.query(Insight).filter(
-            Insight.video_id == video_id
-        ).count()
-        return count
-    except Exception:
-        return 0
+        search_backend, params = _search_params(session.bind, search_term)
+        params.update({'start_date': start_date, 'end_date': end_date})
+        
+        row = session.execute(_videos_summary_statement(search_backend), params).mappings().one()
+        
+        return dict(row)
+        
     finally:
         session.close()
 
+def _cache_key_suffix() -> tuple:
+    """Extra cache-key arguments that expire cached query results."""
+    return _cache_epoch, int(time.time() // VIDEOS_CACHE_TTL)
+
+def get_videos_data(start_date: date, end_date: date, search_term: str = "",
+                    sort_by: str = "total_views", sort_order: str = "desc",
+                    limit: Optional[int] = None, cursor: Optional[tuple] = None) -> pd.DataFrame:
+    """Get a sorted page of videos with metrics for the specified date range.
+    
+    cursor is the (sort value, video_id) of the last row on the previous page.
+    """
+    try:
+        if limit is None:
+            # Full exports carry every description; run them uncached so the
+            # memo never keeps a whole-channel frame alive
+            return _query_videos_data.__wrapped__(
+                start_date, end_date, search_term, sort_by, sort_order, limit, cursor,
+                *_cache_key_suffix()
+            )
+        
+        df = _query_videos_data(
+            start_date, end_date, search_term, sort_by, sort_order, limit, cursor,
+            *_cache_key_suffix()
+        )
+        # Callers add columns, so never hand out the cached frame itself
+        return df.copy()
+    except Exception as e:
+        st.error(f"Error loading videos data: {e}")
+        return pd.DataFrame()
+
+def get_videos_summary(start_date: date, end_date: date, search_term: str = "") -> Dict[str, Any]:
+    """Get the video count, total views, average CTR and insight coverage for the filters."""
+    try:
+        return _query_videos_summary(start_date, end_date, search_term, *_cache_key_suffix())
+    except Exception as e:
+        st.error(f"Error loading videos summary: {e}")
+        return {'total_videos': 0, 'total_views': 0, 'avg_ctr': 0.0, 'videos_with_insights': 0}
+
+def _gemini_video_data(video_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Prepare a videos table record for Gemini."""
+    return {
+        "video_id": video_data["video_id"],
+        "channel_id": video_data["channel_id"],
+        "title": video_data["title"],
+        "impressions": int(video_data["total_impressions"]),
+        "views": int(video_data["total_views"]),
+        "ctr": float(video_data["ctr"]),
+        "avg_view_duration_sec": float(video_data["avg_view_duration"]),
+        "watch_time": int(video_data["total_watch_time"]),
+        "published_at": video_data["published_at"].isoformat() if pd.notna(video_data["published_at"]) else None,
+        "likes": int(video_data["total_likes"]),
+        "comments": int(video_data["total_comments"]),
+        "days_since_published": int(video_data.get("days_since_published", 0))
+    }
+
 def generate_video_insight(video_data: Dict[str, Any]) -> bool:
     """Generate insights for a specific video."""
     try:
+        # Imported lazily so google-generativeai only loads when insights are requested
+        from ..ai.gemini_client import get_insight_generator
         insight_generator = get_insight_generator()
         
-        # Prepare video data for Gemini
-        gemini_data = {
-            "video_id": video_data["video_id"],
-            "channel_id": video_data["channel_id"],
-            "title": video_data["title"],
-            "impressions": int(video_data["total_impressions"]),
-            "views": int(video_data["total_views"]),
-            "ctr": float(video_data["ctr"]),
-            "avg_view_duration_sec": float(video_data["avg_view_duration"]),
-            "watch_time": int(video_data["total_watch_time"]),
-            "published_at": video_data["published_at"].isoformat() if pd.notna(video_data["published_at"]) else None,
-            "likes": int(video_data["total_likes"]),
-            "comments": int(video_data["total_comments"]),
-            "days_since_published": int(video_data.get("days_since_published", 0))
-        }
-        
-        response = insight_generator.generate_insights_for_video(gemini_data)
+        response = insight_generator.generate_insights_for_video(_gemini_video_data(video_data))
+        if response.success:
+            invalidate_videos_cache()
         return response.success
         
     except Exception as e:
         st.error(f"Error generating insights: {e}")
         return False
 
+def generate_video_insights_bulk(records: List[Dict[str, Any]], progress_callback=None) -> int:
+    """Generate insights for many videos, batching prompts and running batches concurrently."""
+    if not records:
+        return 0
+    
+    from ..ai.gemini_client import VIDEO_BATCH_SIZE, get_insight_generator
+    
+    try:
+        # The generator's client rate-limits every Gemini request across workers
+        insight_generator = get_insight_generator()
+        gemini_data = [_gemini_video_data(record) for record in records]
+        batches = [gemini_data[i:i + VIDEO_BATCH_SIZE] for i in range(0, len(gemini_data), VIDEO_BATCH_SIZE)]
+    except Exception as e:
+        st.error(f"Error generating insights: {e}")
+        return 0
+
+    success_count = 0
+    processed = 0
+    
+    # Workers only talk to Gemini and the database; progress is reported from this thread
+    with ThreadPoolExecutor(max_workers=min(5, len(batches))) as executor:
+        futures = {executor.submit(insight_generator.generate_insights_for_videos, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                success_count += sum(response.success for response in future.result())
+            except Exception as e:
+                st.error(f"Error generating insights: {e}")
+            processed += len(batch)
+            if progress_callback:
+                progress_callback(processed, len(records))
+    
+    if success_count:
+        invalidate_videos_cache()
+    
+    return success_count
+
 def render_video_row(video_data: Dict[str, Any], show_thumbnail: bool = True) -> None:
     """Render a single video row with metrics."""
     cols = st.columns([1, 3, 1, 1, 1, 1, 1, 1, 1] if show_thumbnail else [4, 1, 1, 1, 1, 1, 1, 1])
@@ -170,7 +531,14 @@ def render_video_row(video_data: Dict[str, Any], show_thumbnail: bool = True) ->
         with cols[col_idx]:
             if video_data.get('thumbnail_url'):
                 try:
-                    st.image(video_data['thumbnail_url'], width=120)
+                    # Serve the cached image from Streamlit rather than sending every browser to YouTube
+                    thumbnail = _thumbnail_cache().get((video_data['thumbnail_url'], THUMBNAIL_SIZE))
+                    if thumbnail is None:
+                        thumbnail = load_thumbnail(video_data['thumbnail_url'], THUMBNAIL_SIZE)
+                    if thumbnail is not None:
+                        st.image(thumbnail, width=120)
+                    else:
+                        st.write("🖼️")
                 except Exception:
                     st.write("🖼️")
             else:
@@ -179,36 +547,38 @@ def render_video_row(video_data: Dict[str, Any], show_thumbnail: bool = True) ->
     
     # Title and description
     with cols[col_idx]:
-        st.write(f"**{video_data['title'][:60]}{'...' if len(video_data['title']) > 60 else ''}**")
+        title = video_data.get('title_short') or video_data['title']
+        st.write(f"**{title[:TITLE_PREVIEW_CHARS]}{'...' if len(title) > TITLE_PREVIEW_CHARS else ''}**")
         if video_data.get('published_at'):
             st.caption(f"Published: {video_data['published_at'].strftime('%Y-%m-%d')}")
-        if video_data.get('description'):
-            st.caption(f"{video_data['description'][:100]}{'...' if len(video_data['description']) > 100 else ''}")
+        description = video_data.get('desc_short') or video_data.get('description')
+        if description:
+            st.caption(f"{description[:DESCRIPTION_PREVIEW_CHARS]}{'...' if len(description) > DESCRIPTION_PREVIEW_CHARS else ''}")
     col_idx += 1
     
     # Metrics columns
     with cols[col_idx]:
-        st.metric("Impressions", format_number(video_data['total_impressions']))
+        st.metric("Impressions", video_data['impressions_fmt'])
     col_idx += 1
     
     with cols[col_idx]:
-        st.metric("Views", format_number(video_data['total_views']))
+        st.metric("Views", video_data['views_fmt'])
     col_idx += 1
     
     with cols[col_idx]:
-        st.metric("CTR", f"{video_data['ctr']:.2f}%")
+        st.metric("CTR", video_data['ctr_fmt'])
     col_idx += 1
     
     with cols[col_idx]:
-        st.metric("Avg Duration", format_duration(video_data['avg_view_duration']))
+        st.metric("Avg Duration", video_data['avg_duration_fmt'])
     col_idx += 1
     
     with cols[col_idx]:
-        st.metric("Watch Time", format_duration(video_data['total_watch_time']))
+        st.metric("Watch Time", video_data['watch_time_fmt'])
     col_idx += 1
     
     with cols[col_idx]:
-        st.metric("Likes", format_number(video_data['total_likes']))
+        st.metric("Likes", video_data['likes_fmt'])
     col_idx += 1
     
     # Actions column
@@ -219,27 +589,112 @@ def render_video_row(video_data: Dict[str, Any], show_thumbnail: bool = True) ->
         else:
             st.info("No insights")
         
-        if st.button(f"📊 Details", key=f"details_{video_data['video_id']}"):
-            st.session_state['selected_video_id'] = video_data['video_id']
-            st.session_state['current_page'] = 'video_details'
-            st.rerun()
-        
-        if st.button(f"🤖 Generate Insight", key=f"insight_{video_data['video_id']}"):
-            with st.spinner("Generating insights..."):
-                if generate_video_insight(video_data):
-                    st.success("✅ Insights generated!")
-                    st.cache_data.clear()
-                    st.rerun()
-                else:
-                    st.error("❌ Failed to generate insights")
+        render_video_actions(video_data)
 
-def render_videos_table(df: pd.DataFrame, show_thumbnails: bool = True) -> None:
-    """Render the videos table."""
+def render_video_actions(video_data: Dict[str, Any]) -> None:
+    """Render the Details / Generate Insight buttons for a video."""
+    if st.button(f"📊 Details", key=f"details_{video_data['video_id']}"):
+        st.session_state['selected_video_id'] = video_data['video_id']
+        st.session_state['current_page'] = 'video_details'
+        st.rerun()
+    
+    if st.button(f"🤖 Generate Insight", key=f"insight_{video_data['video_id']}"):
+        with st.spinner("Generating insights..."):
+            if generate_video_insight(video_data):
+                st.success("✅ Insights generated!")
+                st.cache_data.clear()
+                st.rerun()
+            else:
+                st.error("❌ Failed to generate insights")
+
+def render_videos_table(df: pd.DataFrame, show_thumbnails: bool = True, detailed: bool = False,
+                        total_count: Optional[int] = None, table_key: str = "videos_table") -> None:
+    """Render the videos table.
+    
+    total_count is the number of matching videos across all pages; table_key
+    identifies the page so row selections don't carry over between pages.
+    """
     if df.empty:
         st.info("No videos found for the selected criteria.")
         return
     
-    st.write(f"**Found {len(df)} videos**")
+    st.write(f"**Found {total_count if total_count is not None else len(df)} videos**")
+    
+    # Videos with no views in the range go into one collapsed table instead of full rows
+    inactive = df[df['total_views'] == 0]
+    active = df[df['total_views'] > 0]
+    
+    if not active.empty:
+        if detailed:
+            render_videos_rows(active, show_thumbnails)
+        else:
+            render_videos_dataframe(active, show_thumbnails, key=table_key)
+    
+    if not inactive.empty:
+        with st.expander(f"{len(inactive)} videos with no activity in this range"):
+            st.dataframe(
+                inactive[['title', 'published_at']],
+                column_config={
+                    'title': st.column_config.TextColumn("Title"),
+                    'published_at': st.column_config.DatetimeColumn("Published", format="YYYY-MM-DD")
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+
+def render_videos_dataframe(df: pd.DataFrame, show_thumbnails: bool = True, key: str = "videos_table") -> None:
+    """Render videos as a single selectable dataframe."""
+    # One dataframe element instead of a dozen widgets per row
+    df_display = df[[
+        'video_id', 'thumbnail_url', 'title', 'published_at', 'total_impressions', 'total_views',
+        'ctr', 'avg_duration_fmt', 'total_watch_time', 'total_likes', 'insight_count'
+    ]].copy()
+    if show_thumbnails:
+        # Embed the server-side cached thumbnails; fall back to the small YouTube image
+        prefetch_thumbnails(df_display['thumbnail_url'].dropna().tolist())
+        df_display['thumbnail_url'] = df_display['thumbnail_url'].map(
+            lambda url: (thumbnail_data_uri(url) or _small_thumbnail_url(url)) if isinstance(url, str) and url else None
+        )
+    
+    column_config = {
+        'video_id': None,
+        'thumbnail_url': st.column_config.ImageColumn("Thumbnail") if show_thumbnails else None,
+        'title': st.column_config.TextColumn("Title", width="large"),
+        'published_at': st.column_config.DatetimeColumn("Published", format="YYYY-MM-DD"),
+        'total_impressions': st.column_config.NumberColumn("Impressions", format="compact"),
+        'total_views': st.column_config.NumberColumn("Views", format="compact"),
+        'ctr': st.column_config.NumberColumn("CTR", format="%.2f%%"),
+        'avg_duration_fmt': st.column_config.TextColumn("Avg Duration"),
+        'total_watch_time': st.column_config.NumberColumn("Watch Time", format="compact"),
+        'total_likes': st.column_config.NumberColumn("Likes", format="compact"),
+        'insight_count': st.column_config.NumberColumn("Insights")
+    }
+    
+    event = st.dataframe(
+        df_display,
+        column_config=column_config,
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=key
+    )
+    
+    selected_rows = event.selection.rows if event is not None else []
+    # A selection made against a longer frame can outlive it on rerun
+    if selected_rows and selected_rows[0] < len(df):
+        video_data = df.iloc[selected_rows[0]].to_dict()
+        st.write(f"**Selected:** {video_data['title']}")
+        col1, col2 = st.columns([1, 5])
+        with col1:
+            render_video_actions(video_data)
+    else:
+        st.caption("Select a row to view details or generate insights.")
+
+def render_videos_rows(df: pd.DataFrame, show_thumbnails: bool = True) -> None:
+    """Render the detailed per-row videos layout."""
+    if show_thumbnails and 'thumbnail_url' in df.columns:
+        prefetch_thumbnails(df['thumbnail_url'].dropna().tolist())
     
     # Table headers
     header_cols = st.columns([1, 3, 1, 1, 1, 1, 1, 1, 1] if show_thumbnails else [4, 1, 1, 1, 1, 1, 1, 1])
@@ -260,10 +715,11 @@ def render_videos_table(df: pd.DataFrame, show_thumbnails: bool = True) -> None:
     
     st.divider()
     
-    # Render video rows
-    for idx, row in df.iterrows():
-        render_video_row(row.to_dict(), show_thumbnails)
-        if idx < len(df) - 1:  # Don't add divider after last row
+    # Render video rows from plain dicts to avoid building a Series per row
+    records = df.to_dict('records')
+    for idx, record in enumerate(records):
+        render_video_row(record, show_thumbnails)
+        if idx < len(records) - 1:  # Don't add divider after last row
             st.divider()
 
 def render_videos_page():
@@ -300,6 +756,7 @@ def render_videos_page():
         st.write("")
         st.write("")
         show_thumbnails = st.checkbox("Show thumbnails", value=True)
+        detailed_rows = st.checkbox("Detailed rows", value=False)
     
     # Validate date range
     if start_date > end_date:
@@ -312,20 +769,8 @@ def render_videos_page():
     with col1:
         sort_by = st.selectbox(
             "Sort by",
-            options=[
-                "total_views", "total_impressions", "ctr", "avg_view_duration",
-                "total_watch_time", "total_likes", "total_comments", "published_at"
-            ],
-            format_func=lambda x: {
-                "total_views": "Views",
-                "total_impressions": "Impressions",
-                "ctr": "CTR",
-                "avg_view_duration": "Avg Duration",
-                "total_watch_time": "Watch Time",
-                "total_likes": "Likes",
-                "total_comments": "Comments",
-                "published_at": "Published Date"
-            }.get(x, x),
+            options=list(VIDEO_SORT_OPTIONS),
+            format_func=lambda x: VIDEO_SORT_OPTIONS.get(x, x),
             key="videos_sort_by"
         )
     
@@ -339,51 +784,78 @@ def render_videos_page():
     
     # Load and display data
     with st.spinner("Loading videos data..."):
-        df = get_videos_data(start_date, end_date, search_term)
+        summary = get_videos_summary(start_date, end_date, search_term)
     
-    if not df.empty:
-        # Apply sorting
-        df_sorted = df.sort_values(
-            by=sort_by,
-            ascending=(sort_order == "asc")
-        )
-        
+    total_count = summary['total_videos']
+    if total_count > 0:
         # Pagination
-        videos_per_page = 10
-        total_pages = (len(df_sorted) + videos_per_page - 1) // videos_per_page
+        total_pages = (total_count + VIDEOS_PER_PAGE - 1) // VIDEOS_PER_PAGE
+        
+        # One cursor per visited page; changing filters or sort starts over
+        query_key = (start_date, end_date, search_term, sort_by, sort_order)
+        if st.session_state.get('videos_cursor_query') != query_key:
+            st.session_state['videos_cursor_query'] = query_key
+            st.session_state['videos_cursors'] = [None]
+        
+        cursors = st.session_state['videos_cursors']
+        page = len(cursors)
+        cursor = cursors[-1]
+        
+        # Reruns that don't change the query (thumbnail toggle, row selection, buttons)
+        # reuse this session's formatted page instead of rebuilding it
+        page_key = (*query_key, cursor, *_cache_key_suffix())
+        
+        if st.session_state.get('videos_page_key') == page_key:
+            df_page = st.session_state['videos_page_data']
+        else:
+            # Only the requested page is sorted, limited and transferred by the database
+            with st.spinner("Loading videos data..."):
+                df_page = get_videos_data(
+                    start_date, end_date, search_term,
+                    sort_by=sort_by,
+                    sort_order=sort_order,
+                    limit=VIDEOS_PER_PAGE,
+                    cursor=cursor
+                )
+            
+            # A failed load returns a bare frame (the error is already shown);
+            # don't format it or pin it for the rest of the session
+            if not df_page.empty:
+                df_page = _add_display_columns(df_page)
+                st.session_state['videos_page_key'] = page_key
+                st.session_state['videos_page_data'] = df_page
         
         if total_pages > 1:
             col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if st.button("⬅️ Previous", disabled=page <= 1, key="videos_prev_page"):
+                    cursors.pop()
+                    st.rerun()
             with col2:
-                page = st.selectbox(
-                    f"Page (1-{total_pages})",
-                    range(1, total_pages + 1),
-                    key="videos_page"
-                )
-            
-            start_idx = (page - 1) * videos_per_page
-            end_idx = start_idx + videos_per_page
-            df_page = df_sorted.iloc[start_idx:end_idx]
-        else:
-            df_page = df_sorted
+                st.write(f"Page {page} of {total_pages}")
+            with col3:
+                if st.button("Next ➡️", disabled=page >= total_pages or df_page.empty, key="videos_next_page"):
+                    last_row = df_page.iloc[-1]
+                    last_value = last_row[sort_by]
+                    if isinstance(last_value, pd.Timestamp):
+                        last_value = last_value.to_pydatetime()
+                    cursors.append((last_value, last_row['video_id']))
+                    st.rerun()
         
         # Summary stats
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Videos", len(df))
+            st.metric("Total Videos", total_count)
         
         with col2:
-            total_views = df['total_views'].sum()
-            st.metric("Total Views", format_number(total_views))
+            st.metric("Total Views", format_number(summary['total_views']))
         
         with col3:
-            avg_ctr = df['ctr'].mean()
-            st.metric("Average CTR", f"{avg_ctr:.2f}%")
+            st.metric("Average CTR", f"{summary['avg_ctr']:.2f}%")
         
         with col4:
-            videos_with_insights = df[df['insight_count'] > 0]
-            st.metric("Videos with Insights", f"{len(videos_with_insights)}/{len(df)}")
+            st.metric("Videos with Insights", f"{summary['videos_with_insights']}/{total_count}")
         
         st.divider()
         
@@ -392,6 +864,7 @@ def render_videos_page():
         
         with col1:
             if st.button("🤖 Generate Insights for All", type="secondary"):
+                from ..auth.youtube_auth import get_authenticator
                 authenticator = get_authenticator()
                 if not authenticator.is_authenticated():
                     st.error("Please authenticate with YouTube first.")
@@ -399,16 +872,15 @@ def render_videos_page():
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    success_count = 0
-                    total_videos = len(df_page)
+                    records = df_page.to_dict('records')
+                    total_videos = len(records)
                     
-                    for idx, row in df_page.iterrows():
-                        status_text.text(f"Processing video {idx + 1}/{total_videos}: {row['title'][:50]}...")
-                        
-                        if generate_video_insight(row.to_dict()):
-                            success_count += 1
-                        
-                        progress_bar.progress((idx + 1) / total_videos)
+                    def update_progress(done: int, total: int) -> None:
+                        status_text.text(f"Processed {done}/{total} videos...")
+                        progress_bar.progress(done / total)
+                    
+                    status_text.text(f"Generating insights for {total_videos} videos...")
+                    success_count = generate_video_insights_bulk(records, update_progress)
                     
                     status_text.text(f"✅ Generated insights for {success_count}/{total_videos} videos")
                     st.cache_data.clear()
@@ -416,7 +888,12 @@ def render_videos_page():
         
         with col2:
             if st.button("📊 Export Data", type="secondary"):
-                csv = df.to_csv(index=False)
+                df_all = get_videos_data(
+                    start_date, end_date, search_term,
+                    sort_by=sort_by,
+                    sort_order=sort_order
+                )
+                csv = df_all.to_csv(index=False)
                 st.download_button(
                     label="Download CSV",
                     data=csv,
@@ -427,7 +904,9 @@ def render_videos_page():
         st.divider()
         
         # Render the videos table
-        render_videos_table(df_page, show_thumbnails)
+        # Keyed per page so a row picked on one page never indexes another
+        render_videos_table(df_page, show_thumbnails, detailed_rows,
+                            total_count=total_count, table_key=f"videos_table_{hash(page_key)}")
         
     else:
         st.warning("No videos found for the selected criteria. Try adjusting your filters or date range.")
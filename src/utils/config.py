@@ -4,14 +4,12 @@ Configuration management for YouTube Analytics Dashboard.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 class Config(BaseSettings):
     """Application configuration settings."""
     
@@ -46,10 +44,12 @@ class Config(BaseSettings):
     # Scheduling Configuration
     auto_refresh_enabled: bool = Field(default=False, env="AUTO_REFRESH_ENABLED")
     auto_refresh_interval_hours: int = Field(default=24, env="AUTO_REFRESH_INTERVAL_HOURS")
+    schedule_enabled: bool = Field(default=False, env="SCHEDULE_ENABLED")
     
     # Cache Configuration
     cache_ttl_seconds: int = Field(default=3600, env="CACHE_TTL_SECONDS")
     cache_max_size: int = Field(default=1000, env="CACHE_MAX_SIZE")
+    cache_backend: str = Field(default="file", env="CACHE_BACKEND")  # file or sqlite
     
     model_config = {
         "env_file": ".env",
@@ -101,9 +101,8 @@ class Config(BaseSettings):
         
         return True
 
-# Global configuration instance
-config = Config()
-
+@lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Get the global configuration instance."""
-    return config
\ No newline at end of file
+    """Get the global configuration instance, loading .env on first use."""
+    load_dotenv()
+    return Config()
\ No newline at end of file
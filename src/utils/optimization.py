@@ -6,211 +6,336 @@ Optimization Utilities - Caching, rate limiting, and scheduling functionality
 import time
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Hashable, Optional, Callable, List, Union
 from functools import wraps
 import hashlib
+import heapq
 import json
 import pickle
+import pickletools
 import os
+import sqlite3
+import struct
 from pathlib import Path
 import logging
-from dataclasses import dataclass
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict
 import schedule
 import streamlit as st
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 from .config import get_config
 
 logger = logging.getLogger(__name__)
 
-@dataclass
 class CacheEntry:
     """Cache entry with value and metadata."""
-    value: Any
-    timestamp: float
-    ttl: float
-    hits: int = 0
     
-    @property
+    # Plain slotted class rather than a dataclass: dataclass(slots=True) needs Python 3.10
+    __slots__ = ('value', 'expiry', 'referenced')
+    
+    def __init__(self, value: Any, expiry: float):
+        self.value = value
+        # Absolute expiry time, so checks are a single comparison
+        self.expiry = expiry
+        # CLOCK reference bit, set on read and cleared by the evictor
+        self.referenced = False
+    
     def is_expired(self) -> bool:
         """Check if cache entry is expired."""
-        return time.time() - self.timestamp > self.ttl
+        return time.time() > self.expiry
+
+def _digest_key(func_name: str, args: tuple, kwargs: dict) -> str:
+    """Stable digest of a function call, usable across processes."""
+    key_data = {
+        'func': func_name,
+        'args': args,
+        'kwargs': sorted(kwargs.items())
+    }
+    key_str = json.dumps(key_data, sort_keys=True, default=str)
+    return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+
+# 1-byte header identifying the serializer used for a cached value
+MSGPACK_HEADER = b'M'
+PICKLE_HEADER = b'P'
+# Pickles larger than this are run through pickletools.optimize
+PICKLE_OPTIMIZE_THRESHOLD = 64 * 1024
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a cached value with msgpack, falling back to pickle."""
+    if msgpack is not None:
+        try:
+            # strict_types keeps tuples and subclasses off the lossy msgpack path
+            return MSGPACK_HEADER + msgpack.packb(value, use_bin_type=True, strict_types=True)
+        except (TypeError, OverflowError, ValueError):
+            # Unsupported types and ints outside 64 bits go to pickle
+            pass
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) > PICKLE_OPTIMIZE_THRESHOLD:
+        # Slower write, smaller and faster reads for the rest of the TTL
+        data = pickletools.optimize(data)
+    return PICKLE_HEADER + data
+
+def _loads(data: bytes) -> Any:
+    """Deserialize a value written by _dumps."""
+    header, payload = data[:1], data[1:]
+    if header == MSGPACK_HEADER:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        # Non-str dict keys (e.g. {1: 'a'}) are valid cached values
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if header == PICKLE_HEADER:
+        return pickle.loads(payload)
+    raise ValueError(f"Unknown cache value header: {header!r}")
+
+class _Shard:
+    """One independently locked slice of a MemoryCache."""
+    __slots__ = ('cache', 'expiry_heap', 'hits', 'lock')
     
-    @property
-    def age(self) -> float:
-        """Get age of cache entry in seconds."""
-        return time.time() - self.timestamp
+    def __init__(self):
+        # Insertion order doubles as the CLOCK ring; OrderedDict keeps head
+        # access and moves O(1) where a dict would skip deleted slots
+        self.cache: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        # Running hit total, so stats() never walks the entries. Bumped on the
+        # lock-free read path, so concurrent hits can be lost: approximate
+        self.hits = 0
+        # (expiry, key) min-heap; may hold stale pairs for replaced or removed keys
+        self.expiry_heap: List[tuple] = []
+        # Guards writes; reads only take it to drop an expired entry
+        self.lock = threading.Lock()
 
 class MemoryCache:
     """In-memory cache with TTL support."""
     
-    def __init__(self, default_ttl: int = 3600, max_size: int = 1000):
+    # Caches smaller than this many entries per shard use a single shard,
+    # so eviction still has a meaningful pool to choose from
+    MIN_ENTRIES_PER_SHARD = 16
+    
+    def __init__(self, default_ttl: int = 3600, max_size: int = 1000, num_shards: int = 16):
         self.default_ttl = default_ttl
         self.max_size = max_size
-        self._cache: Dict[str, CacheEntry] = {}
-        self._access_order: deque = deque()
-        self._lock = threading.RLock()
         
-    def _generate_key(self, func_name: str, args: tuple, kwargs: dict) -> str:
+        # Keys are spread over power-of-two shards so threads touching
+        # different keys don't contend on one lock
+        shard_count = 1
+        while (shard_count * 2 <= num_shards and
+               max_size >= shard_count * 2 * self.MIN_ENTRIES_PER_SHARD):
+            shard_count *= 2
+        self._shards = [_Shard() for _ in range(shard_count)]
+        self._mask = shard_count - 1
+        self._shard_max_size = max(1, max_size // shard_count)
+    
+    def _shard(self, key: str) -> _Shard:
+        """Get the shard holding a key."""
+        return self._shards[hash(key) & self._mask]
+        
+    def _generate_key(self, func_name: str, args: tuple, kwargs: dict) -> Hashable:
         """Generate cache key from function name and arguments."""
-        key_data = {
-            'func': func_name,
-            'args': args,
-            'kwargs': sorted(kwargs.items())
-        }
-        key_str = json.dumps(key_data, sort_keys=True, default=str)
-        return hashlib.md5(key_str.encode()).hexdigest()
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
-        with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                if not entry.is_expired:
-                    entry.hits += 1
-                    # Move to end (most recently used)
-                    if key in self._access_order:
-                        self._access_order.remove(key)
-                    self._access_order.append(key)
-                    return entry.value
-                else:
-                    # Remove expired entry
-                    del self._cache[key]
-                    if key in self._access_order:
-                        self._access_order.remove(key)
-            return None
+        # The call tuple itself is the key, so calls whose arguments merely
+        # hash alike (e.g. -1 and -2) still get separate entries. Each value is
+        # tagged with its type because 1, True and 1.0 compare equal
+        key = (
+            func_name,
+            tuple((type(arg), arg) for arg in args),
+            tuple((name, type(value), value) for name, value in sorted(kwargs.items()))
+        )
+        try:
+            hash(key)
+            return key
+        except TypeError:
+            # Unhashable arguments fall back to a digest of their JSON form
+            return f"{func_name}:{_digest_key(func_name, args, kwargs)}"
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get value from cache, or default on a miss."""
+        shard = self._shard(key)
+        # Lock-free read: a dict lookup plus a reference-bit store
+        entry = shard.cache.get(key)
+        if entry is not None:
+            if not entry.is_expired():
+                shard.hits += 1
+                entry.referenced = True
+                return entry.value
+            else:
+                # Remove expired entry, unless it was replaced meanwhile
+                with shard.lock:
+                    if shard.cache.get(key) is entry:
+                        del shard.cache[key]
+        return default
+    
+    @staticmethod
+    def _evict_one(shard: _Shard) -> None:
+        """Evict one entry using CLOCK (second chance)."""
+        # The ring's head is the hand, so each step is O(1) rather than a
+        # copy of the shard's keys
+        cache = shard.cache
+        while True:
+            key = next(iter(cache))
+            entry = cache[key]
+            if not entry.referenced:
+                cache.popitem(last=False)
+                return
+            # Recently read: clear the bit and move it behind the hand
+            entry.referenced = False
+            cache.move_to_end(key)
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Set value in cache."""
-        with self._lock:
-            ttl = ttl or self.default_ttl
-            
+        ttl = ttl or self.default_ttl
+        shard = self._shard(key)
+        
+        with shard.lock:
             # Remove old entry if exists
-            if key in self._cache:
-                if key in self._access_order:
-                    self._access_order.remove(key)
+            shard.cache.pop(key, None)
             
-            # Check if we need to evict entries
-            while len(self._cache) >= self.max_size:
-                if self._access_order:
-                    oldest_key = self._access_order.popleft()
-                    if oldest_key in self._cache:
-                        del self._cache[oldest_key]
-                else:
-                    break
+            # Evict entries that have not been read recently
+            while shard.cache and len(shard.cache) >= self._shard_max_size:
+                self._evict_one(shard)
             
             # Add new entry
-            self._cache[key] = CacheEntry(
-                value=value,
-                timestamp=time.time(),
-                ttl=ttl
-            )
-            self._access_order.append(key)
+            expiry = time.time() + ttl
+            shard.cache[key] = CacheEntry(value=value, expiry=expiry)
+            heapq.heappush(shard.expiry_heap, (expiry, key))
+            
+            # Rebuild from live entries once stale pairs dominate the heap
+            if len(shard.expiry_heap) > 2 * self._shard_max_size:
+                shard.expiry_heap = [(entry.expiry, k) for k, entry in shard.cache.items()]
+                heapq.heapify(shard.expiry_heap)
     
     def delete(self, key: str) -> bool:
         """Delete entry from cache."""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                if key in self._access_order:
-                    self._access_order.remove(key)
+        shard = self._shard(key)
+        with shard.lock:
+            if key in shard.cache:
+                del shard.cache[key]
                 return True
             return False
     
     def clear(self) -> None:
         """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
-            self._access_order.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.cache.clear()
+                shard.expiry_heap.clear()
+                shard.hits = 0
     
     def cleanup_expired(self) -> int:
         """Remove expired entries and return count removed."""
-        with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry.is_expired
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
-                if key in self._access_order:
-                    self._access_order.remove(key)
-            
-            return len(expired_keys)
+        removed_count = 0
+        now = time.time()
+        
+        for shard in self._shards:
+            with shard.lock:
+                # Pop only the expired head of the heap instead of scanning every entry
+                heap = shard.expiry_heap
+                while heap and heap[0][0] < now:
+                    expiry, key = heapq.heappop(heap)
+                    entry = shard.cache.get(key)
+                    # Skip stale pairs for keys re-set with a later expiry
+                    if entry is not None and entry.expiry <= expiry:
+                        del shard.cache[key]
+                        removed_count += 1
+        
+        return removed_count
     
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        with self._lock:
-            total_hits = sum(entry.hits for entry in self._cache.values())
-            return {
-                'size': len(self._cache),
-                'max_size': self.max_size,
-                'total_hits': total_hits,
-                'expired_count': sum(1 for entry in self._cache.values() if entry.is_expired)
-            }
+        # O(shards): expired entries are only counted by cleanup_expired(),
+        # and total_hits is approximate under concurrent reads
+        return {
+            'size': sum(len(shard.cache) for shard in self._shards),
+            'max_size': self.max_size,
+            'total_hits': sum(shard.hits for shard in self._shards),
+            'heap_size': sum(len(shard.expiry_heap) for shard in self._shards)
+        }
 
 class FileCache:
     """File-based cache for persistent storage."""
     
+    # Absolute expiry time written ahead of the payload, so expiry checks
+    # only need to read the first few bytes of a file
+    EXPIRY_HEADER = struct.Struct('<d')
+    
     def __init__(self, cache_dir: str = ".cache", default_ttl: int = 3600):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.default_ttl = default_ttl
         self._lock = threading.RLock()
+        # Hit counts are kept in memory so reads never rewrite cache files
+        self._hits = defaultdict(int)
     
     def _get_file_path(self, key: str) -> Path:
         """Get file path for cache key."""
         return self.cache_dir / f"{key}.cache"
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from file cache."""
-        with self._lock:
-            file_path = self._get_file_path(key)
-            
-            if not file_path.exists():
-                return None
+    def _iter_cache_files(self) -> List[os.DirEntry]:
+        """List cache files with os.scandir, whose entries carry cached stat data."""
+        with os.scandir(self.cache_dir) as it:
+            return [entry for entry in it if entry.name.endswith('.cache')]
+    
+    def _generate_key(self, func_name: str, args: tuple, kwargs: dict) -> str:
+        """Generate cache key from function name and arguments."""
+        # hash() is salted per process, so file keys always use the digest
+        return _digest_key(func_name, args, kwargs)
+    
+    def _serialize(self, entry: CacheEntry) -> bytes:
+        """Serialize an entry as an expiry header followed by its value."""
+        return self.EXPIRY_HEADER.pack(entry.expiry) + _dumps(entry.value)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get value from file cache, or default on a miss."""
+        # No lock needed: files are replaced atomically, so reads never see partial writes
+        file_path = self._get_file_path(key)
+        
+        try:
+            with open(file_path, 'rb') as f:
+                # Read the payload only once the header shows the entry is live
+                expiry, = self.EXPIRY_HEADER.unpack(f.read(self.EXPIRY_HEADER.size))
+                data = f.read() if expiry >= time.time() else None
             
-            try:
-                with open(file_path, 'rb') as f:
-                    entry = pickle.load(f)
-                
-                if not entry.is_expired:
-                    entry.hits += 1
-                    # Update hits count
-                    with open(file_path, 'wb') as f:
-                        pickle.dump(entry, f)
-                    return entry.value
-                else:
-                    # Remove expired file
-                    file_path.unlink(missing_ok=True)
-                    return None
-                    
-            except Exception as e:
-                logger.warning(f"Error reading cache file {file_path}: {e}")
+            if data is not None:
+                value = _loads(data)
+                self._hits[key] += 1
+                return value
+            else:
+                # Remove expired file
                 file_path.unlink(missing_ok=True)
-                return None
+                self._hits.pop(key, None)
+                return default
+                
+        except FileNotFoundError:
+            return default
+        except Exception as e:
+            logger.warning(f"Error reading cache file {file_path}: {e}")
+            file_path.unlink(missing_ok=True)
+            self._hits.pop(key, None)
+            return default
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Set value in file cache."""
-        with self._lock:
-            ttl = ttl or self.default_ttl
-            file_path = self._get_file_path(key)
-            
-            entry = CacheEntry(
-                value=value,
-                timestamp=time.time(),
-                ttl=ttl
-            )
-            
-            try:
-                with open(file_path, 'wb') as f:
-                    pickle.dump(entry, f)
-            except Exception as e:
-                logger.error(f"Error writing cache file {file_path}: {e}")
+        ttl = ttl or self.default_ttl
+        file_path = self._get_file_path(key)
+        # Unique per writer, so concurrent sets of one key never share a temp file
+        tmp_path = file_path.with_name(f"{file_path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
+        
+        entry = CacheEntry(value=value, expiry=time.time() + ttl)
+        
+        try:
+            tmp_path.write_bytes(self._serialize(entry))
+            # Atomic rename: readers see either the old file or the new one
+            os.replace(tmp_path, file_path)
+            self._hits.pop(key, None)
+        except Exception as e:
+            logger.error(f"Error writing cache file {file_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
     
     def delete(self, key: str) -> bool:
         """Delete entry from file cache."""
         with self._lock:
+            self._hits.pop(key, None)
             file_path = self._get_file_path(key)
             if file_path.exists():
                 file_path.unlink()
@@ -220,29 +345,143 @@ class FileCache:
     def clear(self) -> None:
         """Clear all cache files."""
         with self._lock:
-            for file_path in self.cache_dir.glob("*.cache"):
-                file_path.unlink(missing_ok=True)
+            self._hits.clear()
+            for entry in self._iter_cache_files():
+                Path(entry.path).unlink(missing_ok=True)
     
     def cleanup_expired(self) -> int:
         """Remove expired cache files."""
         with self._lock:
             removed_count = 0
+            now = time.time()
             
-            for file_path in self.cache_dir.glob("*.cache"):
+            for entry in self._iter_cache_files():
+                key = entry.name[:-len('.cache')]
                 try:
-                    with open(file_path, 'rb') as f:
-                        entry = pickle.load(f)
+                    with open(entry.path, 'rb') as f:
+                        expiry, = self.EXPIRY_HEADER.unpack(f.read(self.EXPIRY_HEADER.size))
                     
-                    if entry.is_expired:
-                        file_path.unlink()
+                    if expiry < now:
+                        os.unlink(entry.path)
+                        self._hits.pop(key, None)
                         removed_count += 1
                         
                 except Exception:
                     # Remove corrupted files
-                    file_path.unlink(missing_ok=True)
+                    Path(entry.path).unlink(missing_ok=True)
+                    self._hits.pop(key, None)
                     removed_count += 1
             
             return removed_count
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            cache_files = self._iter_cache_files()
+            total_size = sum(entry.stat().st_size for entry in cache_files)
+            return {
+                'file_count': len(cache_files),
+                'total_size_bytes': total_size,
+                'total_size_mb': total_size / (1024 * 1024),
+                'total_hits': sum(self._hits.values())
+            }
+
+class SqliteCache:
+    """SQLite-backed persistent cache storing all entries in a single file."""
+    
+    # VACUUM rewrites the whole file under an exclusive lock, so cleanup only
+    # runs it once free pages make up this share of the file
+    VACUUM_FREE_RATIO = 0.25
+    
+    def __init__(self, db_path: str = ".cache/cache.db", default_ttl: int = 3600):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+        self._local = threading.local()
+        self._hits = defaultdict(int)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, expiry REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS idx_cache_expiry ON cache (expiry)")
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; every statement is its own transaction
+            conn = sqlite3.connect(str(self.db_path), isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _generate_key(self, func_name: str, args: tuple, kwargs: dict) -> str:
+        """Generate cache key from function name and arguments."""
+        return _digest_key(func_name, args, kwargs)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get value from SQLite cache, or default on a miss."""
+        try:
+            row = self._conn().execute(
+                "SELECT value FROM cache WHERE key = ? AND expiry > ?",
+                (key, time.time())
+            ).fetchone()
+            if row is None:
+                return default
+            value = _loads(row[0])
+            self._hits[key] += 1
+            return value
+        except Exception as e:
+            logger.warning(f"Error reading cache entry {key}: {e}")
+            self.delete(key)
+            return default
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set value in SQLite cache."""
+        ttl = ttl or self.default_ttl
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO cache (key, expiry, value) VALUES (?, ?, ?)",
+                (key, time.time() + ttl, sqlite3.Binary(_dumps(value)))
+            )
+            self._hits.pop(key, None)
+        except Exception as e:
+            logger.error(f"Error writing cache entry {key}: {e}")
+    
+    def delete(self, key: str) -> bool:
+        """Delete entry from SQLite cache."""
+        self._hits.pop(key, None)
+        cursor = self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+    
+    def clear(self) -> None:
+        """Clear all cache entries."""
+        self._hits.clear()
+        self._conn().execute("DELETE FROM cache")
+    
+    def cleanup_expired(self) -> int:
+        """Remove expired cache entries."""
+        conn = self._conn()
+        removed_count = conn.execute("DELETE FROM cache WHERE expiry < ?", (time.time(),)).rowcount
+        if removed_count:
+            free_pages, = conn.execute("PRAGMA freelist_count").fetchone()
+            total_pages, = conn.execute("PRAGMA page_count").fetchone()
+            if total_pages and free_pages / total_pages >= self.VACUUM_FREE_RATIO:
+                # Return freed pages to the filesystem
+                conn.execute("VACUUM")
+        return removed_count
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        entry_count, = self._conn().execute("SELECT COUNT(*) FROM cache").fetchone()
+        total_size = self.db_path.stat().st_size
+        return {
+            'entry_count': entry_count,
+            'total_size_bytes': total_size,
+            'total_size_mb': total_size / (1024 * 1024),
+            'total_hits': sum(self._hits.values())
+        }
 
 class RateLimiter:
     """Token bucket rate limiter."""
@@ -251,24 +490,28 @@ class RateLimiter:
         self.requests_per_window = requests_per_window
         self.window_seconds = window_seconds
         self.tokens = requests_per_window
-        self.last_refill = time.time()
-        self._lock = threading.RLock()
+        # Monotonic clock so wall-clock adjustments cannot skew refills
+        self.last_refill = time.monotonic()
+        self._rate = requests_per_window / window_seconds
+        self._seconds_per_token = window_seconds / requests_per_window
+        self._lock = threading.Lock()
     
     def acquire(self, tokens: int = 1) -> bool:
         """Try to acquire tokens. Returns True if successful."""
         with self._lock:
-            now = time.time()
+            now = time.monotonic()
             
-            # Refill tokens based on elapsed time
-            elapsed = now - self.last_refill
-            tokens_to_add = elapsed * (self.requests_per_window / self.window_seconds)
-            self.tokens = min(self.requests_per_window, self.tokens + tokens_to_add)
+            # Refill tokens based on elapsed time, capped at the bucket size
+            available = self.tokens + (now - self.last_refill) * self._rate
+            if available > self.requests_per_window:
+                available = self.requests_per_window
             self.last_refill = now
             
-            if self.tokens >= tokens:
-                self.tokens -= tokens
+            if available >= tokens:
+                self.tokens = available - tokens
                 return True
             
+            self.tokens = available
             return False
     
     def wait_time(self, tokens: int = 1) -> float:
@@ -277,14 +520,13 @@ class RateLimiter:
             if self.tokens >= tokens:
                 return 0.0
             
-            tokens_needed = tokens - self.tokens
-            return tokens_needed * (self.window_seconds / self.requests_per_window)
+            return (tokens - self.tokens) * self._seconds_per_token
     
     def reset(self) -> None:
         """Reset rate limiter."""
         with self._lock:
             self.tokens = self.requests_per_window
-            self.last_refill = time.time()
+            self.last_refill = time.monotonic()
 
 class GlobalRateLimiters:
     """Global rate limiters for different APIs."""
@@ -292,10 +534,10 @@ class GlobalRateLimiters:
     def __init__(self):
         config = get_config()
         
-        # YouTube Data API: 10,000 units per day
+        # YouTube Data API: daily quota, 10,000 units by default
         self.youtube_data = RateLimiter(
-            requests_per_window=config.rate_limit_requests,
-            window_seconds=config.rate_limit_window
+            requests_per_window=config.youtube_api_quota_limit,
+            window_seconds=86400
         )
         
         # YouTube Analytics API: 50,000 requests per day
@@ -304,9 +546,9 @@ class GlobalRateLimiters:
             window_seconds=3600  # Per hour
         )
         
-        # Gemini API: Depends on tier, default conservative
+        # Gemini API: depends on tier, configured as requests per minute
         self.gemini = RateLimiter(
-            requests_per_window=60,  # 60 requests per minute
+            requests_per_window=config.gemini_api_rate_limit,
             window_seconds=60
         )
 
@@ -320,15 +562,18 @@ def get_memory_cache() -> MemoryCache:
     global _memory_cache
     if _memory_cache is None:
         config = get_config()
-        _memory_cache = MemoryCache(default_ttl=config.cache_ttl)
+        _memory_cache = MemoryCache(default_ttl=config.cache_ttl_seconds)
     return _memory_cache
 
-def get_file_cache() -> FileCache:
-    """Get global file cache instance."""
+def get_file_cache() -> Union[FileCache, SqliteCache]:
+    """Get global persistent cache instance."""
     global _file_cache
     if _file_cache is None:
         config = get_config()
-        _file_cache = FileCache(default_ttl=config.cache_ttl)
+        if config.cache_backend == 'sqlite':
+            _file_cache = SqliteCache(default_ttl=config.cache_ttl_seconds)
+        else:
+            _file_cache = FileCache(default_ttl=config.cache_ttl_seconds)
     return _file_cache
 
 def get_rate_limiters() -> GlobalRateLimiters:
@@ -338,30 +583,71 @@ def get_rate_limiters() -> GlobalRateLimiters:
         _rate_limiters = GlobalRateLimiters()
     return _rate_limiters
 
+class _Flight:
+    """An in-progress cached call that concurrent callers can wait on."""
+    __slots__ = ('event', 'result', 'error')
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+# Returned by cache.get() on a miss, so cached None results count as hits
+_MISS = object()
+
+# Longest a caller waits on another thread computing the same key
+SINGLE_FLIGHT_TIMEOUT = 30
+
 def cached(ttl: Optional[int] = None, 
           use_file_cache: bool = False,
           key_prefix: str = ""):
     """Decorator for caching function results."""
     
     def decorator(func: Callable) -> Callable:
+        func_name = f"{key_prefix}{func.__module__}.{func.__name__}"
+        # Calls currently computing a key, so concurrent misses run func once
+        inflight: Dict[str, _Flight] = {}
+        inflight_lock = threading.Lock()
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
+            # Resolved per call so decorating at import never reads the config
             cache = get_file_cache() if use_file_cache else get_memory_cache()
             
             # Generate cache key
-            func_name = f"{key_prefix}{func.__module__}.{func.__name__}"
-            key = cache._generate_key(func_name, args, kwargs) if hasattr(cache, '_generate_key') else f"{func_name}_{hash((args, tuple(sorted(kwargs.items()))))}"
+            key = cache._generate_key(func_name, args, kwargs)
             
-            # Try to get from cache
-            result = cache.get(key)
-            if result is not None:
+            # Try to get from cache; None is a cacheable result, so misses use a sentinel
+            result = cache.get(key, _MISS)
+            if result is not _MISS:
                 return result
             
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            cache.set(key, result, ttl)
+            with inflight_lock:
+                flight = inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = inflight[key] = _Flight()
             
-            return result
+            if not leader:
+                # Share the leader's result, including None; recompute only
+                # if it failed or took too long
+                if flight.event.wait(timeout=SINGLE_FLIGHT_TIMEOUT) and flight.error is None:
+                    return flight.result
+                return func(*args, **kwargs)
+            
+            # Execute function and cache result
+            try:
+                result = func(*args, **kwargs)
+                cache.set(key, result, ttl)
+                flight.result = result
+                return result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with inflight_lock:
+                    inflight.pop(key, None)
+                flight.event.set()
         
         return wrapper
     return decorator
@@ -370,15 +656,14 @@ def rate_limited(limiter_name: str, tokens: int = 1, wait: bool = True):
     """Decorator for rate limiting function calls."""
     
     def decorator(func: Callable) -> Callable:
+        limiter = getattr(get_rate_limiters(), limiter_name, None)
+        
+        if limiter is None:
+            logger.warning(f"Rate limiter '{limiter_name}' not found")
+            return func
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            limiters = get_rate_limiters()
-            limiter = getattr(limiters, limiter_name, None)
-            
-            if limiter is None:
-                logger.warning(f"Rate limiter '{limiter_name}' not found")
-                return func(*args, **kwargs)
-            
             if not limiter.acquire(tokens):
                 if wait:
                     wait_time = limiter.wait_time(tokens)
@@ -396,11 +681,15 @@ def rate_limited(limiter_name: str, tokens: int = 1, wait: bool = True):
 class TaskScheduler:
     """Simple task scheduler for background operations."""
     
+    # Upper bound on a single wait, so jobs added after start() are picked up
+    MAX_IDLE_SECONDS = 60
+    
     def __init__(self):
         self.jobs: List[Callable] = []
         self.running = False
         self._thread: Optional[threading.Thread] = None
         self._lock = threading.RLock()
+        self._stop_event = threading.Event()
     
     def add_job(self, func: Callable, interval_hours: int = 24, 
                run_immediately: bool = False) -> None:
@@ -419,6 +708,7 @@ class TaskScheduler:
                 return
             
             self.running = True
+            self._stop_event.clear()
             self._thread = threading.Thread(target=self._run_scheduler, daemon=True)
             self._thread.start()
             logger.info("Task scheduler started")
@@ -427,6 +717,7 @@ class TaskScheduler:
         """Stop the scheduler."""
         with self._lock:
             self.running = False
+            self._stop_event.set()
             if self._thread:
                 self._thread.join(timeout=5)
             logger.info("Task scheduler stopped")
@@ -441,13 +732,17 @@ class TaskScheduler:
                 logger.error(f"Error running immediate job: {e}")
         
         # Run scheduled jobs
-        while self.running:
+        while not self._stop_event.is_set():
             try:
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                # Sleep until the next job is due; stop() wakes the wait immediately
+                idle_seconds = schedule.idle_seconds()
+                if idle_seconds is None:
+                    idle_seconds = self.MAX_IDLE_SECONDS
+                self._stop_event.wait(timeout=min(max(idle_seconds, 0), self.MAX_IDLE_SECONDS))
             except Exception as e:
                 logger.error(f"Error in scheduler: {e}")
-                time.sleep(60)
+                self._stop_event.wait(timeout=self.MAX_IDLE_SECONDS)
 
 # Global scheduler instance
 _scheduler = None
@@ -491,14 +786,7 @@ def get_cache_stats() -> Dict[str, Any]:
         stats['memory'] = {'error': str(e)}
     
     try:
-        file_cache = get_file_cache()
-        cache_files = list(file_cache.cache_dir.glob("*.cache"))
-        total_size = sum(f.stat().st_size for f in cache_files)
-        stats['file'] = {
-            'file_count': len(cache_files),
-            'total_size_bytes': total_size,
-            'total_size_mb': total_size / (1024 * 1024)
-        }
+        stats['file'] = get_file_cache().stats()
     except Exception as e:
         logger.error(f"Error getting file cache stats: {e}")
         stats['file'] = {'error': str(e)}
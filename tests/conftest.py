@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures
+"""
+
+import pytest
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+from unittest.mock import Mock, patch
+from cryptography.fernet import Fernet
+
+import sys
+# Make the src package importable for every test module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.helpers import GenResponse
+
+def pytest_addoption(parser):
+    """Register the --slow opt-in flag."""
+    parser.addoption("--slow", action="store_true", default=False,
+                     help="also run tests marked slow")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests, visibly, unless --slow or an explicit -m expression is given."""
+    if config.getoption("--slow") or config.option.markexpr:
+        return
+    
+    skip_slow = pytest.mark.skip(reason="slow test; pass --slow to run")
+    for item in items:
+        if item.get_closest_marker("slow") is not None:
+            item.add_marker(skip_slow)
+
+@dataclass
+class StubConfig:
+    """Plain stand-in for Config exposing the settings the tests read."""
+    youtube_client_id: str = "test_client_id"
+    youtube_client_secret: str = "test_client_secret"
+    youtube_redirect_uri: str = "http://localhost:8501"
+    youtube_scopes: List[str] = field(
+        default_factory=lambda: ["https://www.googleapis.com/auth/youtube.readonly"]
+    )
+    database_url: str = "sqlite:///:memory:"
+
+@pytest.fixture(scope="session")
+def mock_config():
+    """Create a stub configuration shared by the whole session.
+
+    Tests only read from it, so one instance is safe to share.
+    """
+    return StubConfig()
+
+@pytest.fixture(scope="session")
+def temp_credentials_file(tmp_path_factory):
+    """Create a read-only credentials file shared by the whole session."""
+    credentials_file = tmp_path_factory.mktemp("auth") / "credentials.json"
+    credentials_data = {
+        "installed": {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token"
+        }
+    }
+    credentials_file.write_text(json.dumps(credentials_data))
+    return str(credentials_file)
+
+@pytest.fixture(scope="session")
+def prebuilt_key():
+    """Provide one Fernet key for every test that needs an encryption key.
+
+    The key only lives in memory for the session, never on disk.
+    """
+    return Fernet.generate_key()
+
+@pytest.fixture(scope="session")
+def prebuilt_fernet(prebuilt_key):
+    """Build one Fernet instance for the shared session key."""
+    return Fernet(prebuilt_key)
+
+@pytest.fixture(scope="module")
+def mock_genai(request):
+    """Patch the Gemini SDK once per module with a canned model response.
+
+    Parametrize indirectly to choose the response text the model returns.
+    """
+    response_text = getattr(request, "param", "[]")
+    with patch('src.ai.gemini_client.genai') as mock_genai:
+        mock_model = Mock()
+        mock_model.generate_content.return_value = GenResponse(text=response_text)
+        mock_genai.GenerativeModel.return_value = mock_model
+        yield mock_genai
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""
+Shared test helpers
+"""
+
+from collections import namedtuple
+
+# Stand-in for a Gemini SDK response; only .text is read
+GenResponse = namedtuple("GenResponse", ["text"])
@@ -4,447 +4,414 @@ Unit tests for YouTube authentication module
 """
 
 import pytest
-import os
-import tempfile
 import json
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+from cryptography.fernet import InvalidToken
+from google.oauth2.credentials import Credentials
+from googleapiclient.errors import HttpError
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import src.auth.youtube_auth as youtube_auth
+from src.auth.youtube_auth import YouTubeAuthenticator, get_authenticator
 
-from src.auth.youtube_auth import YouTubeAuthenticator
-from src.utils.config import Config
+# Shared, read-only channel fixtures for the get_channel_info cases
+_MOCK_CHANNEL_RESPONSE = MappingProxyType({
+    'items': [{
+        'id': 'channel_123',
+        'snippet': {
+            'title': 'Test Channel',
+            'description': 'Test Description',
+            'thumbnails': {
+                'default': {'url': 'http://example.com/thumb.jpg'}
+            }
+        },
+        'statistics': {
+            'subscriberCount': '1000',
+            'videoCount': '50',
+            'viewCount': '100000'
+        }
+    }]
+})
+
+_API_ERROR = HttpError(resp=SimpleNamespace(status=403, reason="Forbidden"), content=b"API Error")
+
+_CREDENTIALS_DATA = MappingProxyType({
+    "token": "test_token",
+    "refresh_token": "test_refresh",
+    "token_uri": "https://oauth2.googleapis.com/token",
+    "client_id": "test_client_id",
+    "client_secret": "test_client_secret",
+    "scopes": ["https://www.googleapis.com/auth/youtube.readonly"]
+})
+
+@pytest.fixture(autouse=True, scope="module")
+def _reset_authenticator_singleton():
+    """Start the module without a cached authenticator and restore it afterwards."""
+    previous = youtube_auth._authenticator
+    youtube_auth._authenticator = None
+    yield
+    youtube_auth._authenticator = previous
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(monkeypatch, tmp_path):
+    """Run each test in its own directory so default key and token files never collide."""
+    monkeypatch.chdir(tmp_path)
+
+def _stub_channels_list(service, execute_ret=None, execute_exc=None):
+    """Stub service.channels().list().execute without recording the chained calls."""
+    execute = Mock(return_value=execute_ret, side_effect=execute_exc)
+    service.channels.return_value.list.return_value.execute = execute
+    return execute
 
 class TestYouTubeAuthenticator:
     """Test cases for YouTubeAuthenticator class."""
     
-    @pytest.fixture
-    def mock_config(self):
-        """Create a mock configuration."""
-        config = Mock(spec=Config)
-        config.youtube_client_id = "test_client_id"
-        config.youtube_client_secret = "test_client_secret"
-        config.youtube_scopes = ["https://www.googleapis.com/auth/youtube.readonly"]
-        return config
+    @pytest.fixture(autouse=True)
+    def _patch_get_config(self, monkeypatch, mock_config):
+        """Serve the shared mock configuration to every authenticator."""
+        monkeypatch.setattr(youtube_auth, 'get_config', lambda: mock_config)
     
     @pytest.fixture
-    def temp_credentials_file(self):
-        """Create a temporary credentials file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            credentials_data = {
-                "installed": {
-                    "client_id": "test_client_id",
-                    "client_secret": "test_client_secret",
-                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token"
-                }
-            }
-            json.dump(credentials_data, f)
-            temp_file = f.name
-        
-        yield temp_file
-        
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
+    def real_authenticator(self, temp_credentials_file):
+        """Create YouTubeAuthenticator instance using the real key handling."""
+        auth = YouTubeAuthenticator()
+        auth.credentials_file = temp_credentials_file
+        return auth
     
     @pytest.fixture
-    def authenticator(self, mock_config, temp_credentials_file):
+    def authenticator(self, monkeypatch, tmp_path, prebuilt_key, prebuilt_fernet, temp_credentials_file):
         """Create YouTubeAuthenticator instance for testing."""
-        with patch('src.auth.youtube_auth.get_config', return_value=mock_config):
-            auth = YouTubeAuthenticator()
-            auth.credentials_file = temp_credentials_file
-            return auth
+        # Reuse the session key instead of generating or reading one per test
+        monkeypatch.setattr(YouTubeAuthenticator, '_get_or_create_encryption_key',
+                            lambda self: prebuilt_key)
+        # Every encrypt/decrypt call gets the one Fernet built for that key
+        monkeypatch.setattr(youtube_auth, 'Fernet', lambda key: prebuilt_fernet)
+        auth = YouTubeAuthenticator()
+        auth.credentials_file = temp_credentials_file
+        auth.token_file = tmp_path / "token.encrypted"
+        return auth
+    
+    def test_stub_config_matches_config(self, mock_config):
+        """Test the shared stub only exposes settings that Config defines."""
+        from dataclasses import fields
+        from src.utils.config import Config
+        
+        for stub_field in fields(mock_config):
+            assert stub_field.name in Config.model_fields or hasattr(Config, stub_field.name)
     
     def test_init(self, mock_config):
         """Test authenticator initialization."""
-        with patch('src.auth.youtube_auth.get_config', return_value=mock_config):
-            auth = YouTubeAuthenticator()
-            
-            assert auth.config == mock_config
-            assert auth.credentials is None
-            assert auth.service is None
-    
-    def test_generate_encryption_key(self, authenticator):
-        """Test encryption key generation."""
-        key1 = authenticator._generate_encryption_key()
-        key2 = authenticator._generate_encryption_key()
-        
-        # Keys should be different each time
-        assert key1 != key2
-        assert len(key1) == 44  # Base64 encoded 32-byte key
-    
-    def test_encrypt_decrypt_credentials(self, authenticator):
+        auth = YouTubeAuthenticator()
+        
+        assert auth.config == mock_config
+        assert auth.token_file == Path("token.encrypted")
+        assert auth._credentials is None
+    
+    def test_get_or_create_encryption_key(self, real_authenticator):
+        """Test the encryption key is created once and then reused."""
+        key = real_authenticator._get_or_create_encryption_key()
+        
+        # The key written on init is read back rather than regenerated
+        assert key == real_authenticator._encryption_key
+        assert Path("encryption.key").read_bytes() == key
+        assert len(key) == 44  # Base64 encoded 32-byte key
+    
+    @pytest.mark.parametrize("test_data", [
+        pytest.param({"access_token": "test_token", "refresh_token": "test_refresh"}, id="tokens"),
+        pytest.param({"access_token": "t\u00f6ken", "scopes": ["a", "b"]}, id="unicode_and_list"),
+        pytest.param({}, id="empty"),
+    ])
+    def test_encrypt_decrypt_credentials(self, authenticator, test_data):
         """Test credential encryption and decryption."""
-        test_data = {"access_token": "test_token", "refresh_token": "test_refresh"}
-        
         # Encrypt
-        encrypted = authenticator._encrypt_credentials(test_data)
+        encrypted = authenticator._encrypt_data(test_data)
         assert encrypted != test_data
         assert isinstance(encrypted, bytes)
         
         # Decrypt
-        decrypted = authenticator._decrypt_credentials(encrypted)
+        decrypted = authenticator._decrypt_data(encrypted)
         assert decrypted == test_data
     
-    def test_encrypt_decrypt_with_invalid_data(self, authenticator):
+    def test_encrypt_decrypt_with_invalid_data(self, real_authenticator):
         """Test encryption/decryption with invalid data."""
-        # Test decryption with invalid data
-        with pytest.raises(Exception):
-            authenticator._decrypt_credentials(b"invalid_encrypted_data")
+        # Smoke test of the unpatched crypto path
+        with pytest.raises(InvalidToken):
+            real_authenticator._decrypt_data(b"invalid_encrypted_data")
     
-    @patch('src.auth.youtube_auth.InstalledAppFlow')
-    def test_authenticate_success(self, mock_flow_class, authenticator):
-        """Test successful authentication."""
-        # Mock the flow and credentials
-        mock_flow = Mock()
-        mock_credentials = Mock()
-        mock_credentials.to_json.return_value = '{"token": "test_token"}'
-        mock_flow.run_local_server.return_value = mock_credentials
-        mock_flow_class.from_client_secrets_file.return_value = mock_flow
-        
-        # Mock service creation
-        with patch('src.auth.youtube_auth.build') as mock_build:
-            mock_service = Mock()
-            mock_build.return_value = mock_service
-            
-            result = authenticator.authenticate()
-            
+    @pytest.fixture
+    def mocked_flow(self, monkeypatch):
+        """Replace Flow with a flow that yields serializable credentials."""
+        credentials = SimpleNamespace(**_CREDENTIALS_DATA)
+        flow_instance = Mock(credentials=credentials)
+        flow_instance.authorization_url.return_value = ("https://accounts.google.com/o/oauth2/auth?x=1", "state")
+        flow_class = Mock()
+        flow_class.from_client_config.return_value = flow_instance
+        monkeypatch.setattr(youtube_auth, 'Flow', flow_class)
+        return SimpleNamespace(cls=flow_class, instance=flow_instance, credentials=credentials)
+    
+    def test_get_authorization_url(self, mocked_flow, authenticator, mock_config):
+        """Test the authorization URL comes from a flow built from the config."""
+        result = authenticator.get_authorization_url()
+        
+        assert result == "https://accounts.google.com/o/oauth2/auth?x=1"
+        client_config = mocked_flow.cls.from_client_config.call_args.args[0]
+        assert client_config["web"]["client_id"] == mock_config.youtube_client_id
+        mocked_flow.instance.authorization_url.assert_called_once_with(
+            access_type='offline', include_granted_scopes='true', prompt='consent'
+        )
+    
+    @pytest.mark.parametrize("fetch_error", [
+        pytest.param(None, id="success"),
+        pytest.param(Exception("Auth failed"), id="failure"),
+    ])
+    def test_handle_oauth_callback(self, mocked_flow, authenticator, fetch_error):
+        """Test exchanging the authorization code succeeds or fails cleanly."""
+        mocked_flow.instance.fetch_token.side_effect = fetch_error
+        
+        result = authenticator.handle_oauth_callback("auth_code")
+        
+        mocked_flow.instance.fetch_token.assert_called_once_with(code="auth_code")
+        if fetch_error is None:
             assert result is True
-            assert authenticator.credentials == mock_credentials
-            assert authenticator.service == mock_service
-            
-            # Verify flow was configured correctly
-            mock_flow_class.from_client_secrets_file.assert_called_once()
-            mock_flow.run_local_server.assert_called_once()
-    
-    @patch('src.auth.youtube_auth.InstalledAppFlow')
-    def test_authenticate_failure(self, mock_flow_class, authenticator):
-        """Test authentication failure."""
-        # Mock flow to raise exception
-        mock_flow = Mock()
-        mock_flow.run_local_server.side_effect = Exception("Auth failed")
-        mock_flow_class.from_client_secrets_file.return_value = mock_flow
-        
-        result = authenticator.authenticate()
-        
-        assert result is False
-        assert authenticator.credentials is None
-        assert authenticator.service is None
+            assert authenticator._credentials == mocked_flow.credentials
+            assert authenticator.token_file.exists()
+        else:
+            assert result is False
+            assert authenticator._credentials is None
+            assert not authenticator.token_file.exists()
     
     def test_is_authenticated_with_credentials(self, authenticator):
-        """Test is_authenticated with valid credentials."""
-        mock_credentials = Mock()
-        mock_credentials.valid = True
-        authenticator.credentials = mock_credentials
+        """Test is_authenticated with unexpired credentials."""
+        authenticator._credentials = SimpleNamespace(expired=False)
         
         assert authenticator.is_authenticated() is True
     
     def test_is_authenticated_without_credentials(self, authenticator):
-        """Test is_authenticated without credentials."""
-        authenticator.credentials = None
+        """Test is_authenticated without credentials or a token file."""
+        authenticator._credentials = None
         
         assert authenticator.is_authenticated() is False
     
     def test_is_authenticated_with_invalid_credentials(self, authenticator):
-        """Test is_authenticated with invalid credentials."""
-        mock_credentials = Mock()
-        mock_credentials.valid = False
-        authenticator.credentials = mock_credentials
+        """Test is_authenticated with expired credentials that fail to refresh."""
+        authenticator._credentials = self._unrefreshable_credentials()
         
         assert authenticator.is_authenticated() is False
     
-    def test_refresh_credentials_success(self, authenticator):
-        """Test successful credential refresh."""
+    @staticmethod
+    def _refreshable_credentials():
+        """Credentials whose refresh succeeds."""
         mock_credentials = Mock()
         mock_credentials.valid = False
         mock_credentials.expired = True
         mock_credentials.refresh_token = "refresh_token"
-        authenticator.credentials = mock_credentials
         
-        with patch('src.auth.youtube_auth.Request') as mock_request:
-            mock_request_instance = Mock()
-            mock_request.return_value = mock_request_instance
-            
-            # Mock successful refresh
-            def refresh_side_effect(request):
-                mock_credentials.valid = True
-                mock_credentials.expired = False
-            
-            mock_credentials.refresh.side_effect = refresh_side_effect
-            
-            result = authenticator.refresh_credentials()
-            
-            assert result is True
-            mock_credentials.refresh.assert_called_once_with(mock_request_instance)
+        def refresh_side_effect(request):
+            mock_credentials.valid = True
+            mock_credentials.expired = False
+        
+        mock_credentials.refresh.side_effect = refresh_side_effect
+        return mock_credentials
     
-    def test_refresh_credentials_failure(self, authenticator):
-        """Test credential refresh failure."""
+    @staticmethod
+    def _unrefreshable_credentials():
+        """Credentials whose refresh raises."""
         mock_credentials = Mock()
         mock_credentials.refresh.side_effect = Exception("Refresh failed")
-        authenticator.credentials = mock_credentials
-        
-        with patch('src.auth.youtube_auth.Request'):
+        return mock_credentials
+    
+    @pytest.mark.parametrize("make_credentials,expected", [
+        pytest.param("_refreshable_credentials", True, id="success"),
+        pytest.param("_unrefreshable_credentials", False, id="failure"),
+        pytest.param(None, False, id="no_credentials"),
+    ])
+    def test_refresh_credentials(self, authenticator, monkeypatch, make_credentials, expected):
+        """Test credential refresh outcomes."""
+        mock_credentials = getattr(self, make_credentials)() if make_credentials else None
+        authenticator._credentials = mock_credentials
+        save_credentials = Mock()
+        monkeypatch.setattr(authenticator, '_save_credentials', save_credentials)
+        
+        with patch.object(youtube_auth, 'Request') as mock_request:
             result = authenticator.refresh_credentials()
-            
-            assert result is False
-    
-    def test_refresh_credentials_no_credentials(self, authenticator):
-        """Test refresh with no credentials."""
-        authenticator.credentials = None
         
-        result = authenticator.refresh_credentials()
-        
-        assert result is False
-    
-    def test_create_service_success(self, authenticator):
-        """Test successful service creation."""
-        mock_credentials = Mock()
-        authenticator.credentials = mock_credentials
-        
-        with patch('src.auth.youtube_auth.build') as mock_build:
+        assert result is expected
+        if expected:
+            mock_credentials.refresh.assert_called_once_with(mock_request.return_value)
+            save_credentials.assert_called_once_with(mock_credentials)
+        else:
+            save_credentials.assert_not_called()
+    
+    @pytest.mark.parametrize("build_error", [
+        pytest.param(None, id="success"),
+        pytest.param(_API_ERROR, id="failure"),
+    ])
+    def test_get_youtube_service(self, authenticator, build_error):
+        """Test service creation outcomes."""
+        mock_credentials = SimpleNamespace(expired=False)
+        authenticator._credentials = mock_credentials
+        
+        with patch.object(youtube_auth, 'build') as mock_build:
             mock_service = Mock()
             mock_build.return_value = mock_service
+            mock_build.side_effect = build_error
             
-            result = authenticator.create_service()
-            
-            assert result == mock_service
-            assert authenticator.service == mock_service
-            mock_build.assert_called_once_with(
-                'youtube', 'v3', credentials=mock_credentials
-            )
-    
-    def test_create_service_no_credentials(self, authenticator):
-        """Test service creation without credentials."""
-        authenticator.credentials = None
-        
-        result = authenticator.create_service()
-        
-        assert result is None
-        assert authenticator.service is None
-    
-    def test_create_service_failure(self, authenticator):
-        """Test service creation failure."""
-        mock_credentials = Mock()
-        authenticator.credentials = mock_credentials
-        
-        with patch('src.auth.youtube_auth.build') as mock_build:
-            mock_build.side_effect = Exception("Service creation failed")
-            
-            result = authenticator.create_service()
-            
-            assert result is None
-            assert authenticator.service is None
-    
-    def test_get_channel_info_success(self, authenticator):
-        """Test successful channel info retrieval."""
+            if build_error is None:
+                assert authenticator.get_youtube_service() == mock_service
+            else:
+                with pytest.raises(HttpError):
+                    authenticator.get_youtube_service()
+        
+        mock_build.assert_called_once_with(
+            'youtube', 'v3', credentials=mock_credentials, cache_discovery=False
+        )
+    
+    def test_get_youtube_service_not_authenticated(self, authenticator):
+        """Test service creation refuses to run without credentials."""
+        authenticator._credentials = None
+        
+        with patch.object(youtube_auth, 'build') as mock_build:
+            with pytest.raises(ValueError):
+                authenticator.get_youtube_service()
+        
+        mock_build.assert_not_called()
+    
+    @pytest.mark.parametrize("response,api_error,expected", [
+        pytest.param(_MOCK_CHANNEL_RESPONSE, None, _MOCK_CHANNEL_RESPONSE['items'][0], id="success"),
+        pytest.param(None, _API_ERROR, None, id="api_error"),
+        pytest.param({'items': []}, None, None, id="empty_response"),
+    ])
+    def test_get_channel_info(self, authenticator, monkeypatch, response, api_error, expected):
+        """Test channel info retrieval outcomes."""
         mock_service = Mock()
-        authenticator.service = mock_service
-        
-        # Mock API response
-        mock_response = {
-            'items': [{
-                'id': 'channel_123',
-                'snippet': {
-                    'title': 'Test Channel',
-                    'description': 'Test Description',
-                    'thumbnails': {
-                        'default': {'url': 'http://example.com/thumb.jpg'}
-                    }
-                },
-                'statistics': {
-                    'subscriberCount': '1000',
-                    'videoCount': '50',
-                    'viewCount': '100000'
-                }
-            }]
-        }
-        
-        mock_service.channels().list().execute.return_value = mock_response
+        _stub_channels_list(mock_service, execute_ret=response, execute_exc=api_error)
+        monkeypatch.setattr(authenticator, 'get_youtube_service', lambda: mock_service)
         
         result = authenticator.get_channel_info()
         
-        expected = {
-            'id': 'channel_123',
-            'title': 'Test Channel',
-            'description': 'Test Description',
-            'thumbnail': 'http://example.com/thumb.jpg',
-            'subscriber_count': 1000,
-            'video_count': 50,
-            'view_count': 100000
-        }
-        
         assert result == expected
     
-    def test_get_channel_info_no_service(self, authenticator):
-        """Test channel info retrieval without service."""
-        authenticator.service = None
-        
-        result = authenticator.get_channel_info()
-        
-        assert result is None
-    
-    def test_get_channel_info_api_error(self, authenticator):
-        """Test channel info retrieval with API error."""
-        mock_service = Mock()
-        authenticator.service = mock_service
-        
-        mock_service.channels().list().execute.side_effect = Exception("API Error")
-        
-        result = authenticator.get_channel_info()
-        
-        assert result is None
-    
-    def test_get_channel_info_empty_response(self, authenticator):
-        """Test channel info retrieval with empty response."""
-        mock_service = Mock()
-        authenticator.service = mock_service
-        
-        mock_response = {'items': []}
-        mock_service.channels().list().execute.return_value = mock_response
-        
-        result = authenticator.get_channel_info()
-        
-        assert result is None
-    
-    def test_revoke_credentials_success(self, authenticator):
-        """Test successful credential revocation."""
-        mock_credentials = Mock()
-        mock_credentials.token = "test_token"
-        authenticator.credentials = mock_credentials
-        
-        with patch('requests.post') as mock_post:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_post.return_value = mock_response
-            
-            result = authenticator.revoke_credentials()
-            
-            assert result is True
-            assert authenticator.credentials is None
-            assert authenticator.service is None
-            
-            mock_post.assert_called_once()
-    
-    def test_revoke_credentials_no_credentials(self, authenticator):
-        """Test credential revocation without credentials."""
-        authenticator.credentials = None
+    @pytest.mark.parametrize("has_credentials,post_error,expected", [
+        pytest.param(True, None, True, id="success"),
+        pytest.param(False, None, True, id="no_credentials"),
+        pytest.param(True, Exception("Revoke failed"), False, id="api_error"),
+    ])
+    def test_revoke_credentials(self, authenticator, monkeypatch, has_credentials, post_error, expected):
+        """Test credential revocation outcomes."""
+        if has_credentials:
+            authenticator._credentials = SimpleNamespace(token="test_token")
+        else:
+            authenticator._credentials = None
+        authenticator.token_file.write_bytes(b"token")
+        
+        post_calls = []
+        
+        def fake_post(*args, **kwargs):
+            post_calls.append((args, kwargs))
+            if post_error is not None:
+                raise post_error
+            return SimpleNamespace(status_code=200)
+        
+        monkeypatch.setattr('requests.post', fake_post)
         
         result = authenticator.revoke_credentials()
         
-        assert result is False
-    
-    def test_revoke_credentials_api_error(self, authenticator):
-        """Test credential revocation with API error."""
-        mock_credentials = Mock()
-        mock_credentials.token = "test_token"
-        authenticator.credentials = mock_credentials
-        
-        with patch('requests.post') as mock_post:
-            mock_post.side_effect = Exception("Revoke failed")
-            
-            result = authenticator.revoke_credentials()
-            
-            assert result is False
-            # Credentials should still be cleared on error
-            assert authenticator.credentials is None
-            assert authenticator.service is None
-    
-    def test_save_load_credentials(self, authenticator):
+        assert result is expected
+        # Only held credentials are revoked with Google
+        assert len(post_calls) == int(has_credentials)
+        if expected:
+            assert authenticator._credentials is None
+            assert not authenticator.token_file.exists()
+        else:
+            # A failed revoke keeps the stored token for a retry
+            assert authenticator.token_file.exists()
+    
+    def test_save_load_credentials(self, authenticator, monkeypatch, tmp_path):
         """Test saving and loading credentials."""
-        test_credentials = {
-            "token": "test_token",
-            "refresh_token": "test_refresh",
-            "token_uri": "https://oauth2.googleapis.com/token",
-            "client_id": "test_client_id",
-            "client_secret": "test_client_secret"
-        }
+        # Round-trip wiring only; encryption itself is covered separately
+        monkeypatch.setattr(authenticator, '_encrypt_data', lambda data: json.dumps(data).encode())
+        monkeypatch.setattr(authenticator, '_decrypt_data', lambda data: json.loads(data))
+        authenticator.token_file = tmp_path / "token.encrypted"
         
         # Save credentials
-        authenticator._save_credentials(test_credentials)
+        authenticator._save_credentials(Credentials(**_CREDENTIALS_DATA))
         
         # Load credentials
         loaded_credentials = authenticator._load_credentials()
         
-        assert loaded_credentials == test_credentials
+        assert isinstance(loaded_credentials, Credentials)
+        for name, value in _CREDENTIALS_DATA.items():
+            assert getattr(loaded_credentials, name) == value
     
-    def test_load_credentials_file_not_exists(self, authenticator):
+    def test_load_credentials_file_not_exists(self, authenticator, tmp_path):
         """Test loading credentials when file doesn't exist."""
-        # Ensure token file doesn't exist
-        if os.path.exists(authenticator.token_file):
-            os.unlink(authenticator.token_file)
+        authenticator.token_file = tmp_path / "token.encrypted"
         
         result = authenticator._load_credentials()
         
         assert result is None
     
-    def test_load_credentials_corrupted_file(self, authenticator):
+    def test_load_credentials_corrupted_file(self, authenticator, tmp_path):
         """Test loading credentials from corrupted file."""
         # Create corrupted token file
-        with open(authenticator.token_file, 'wb') as f:
-            f.write(b"corrupted_data")
+        authenticator.token_file = tmp_path / "token.encrypted"
+        authenticator.token_file.write_bytes(b"corrupted_data")
         
         result = authenticator._load_credentials()
         
         assert result is None
-        
-        # Cleanup
-        if os.path.exists(authenticator.token_file):
-            os.unlink(authenticator.token_file)
 
+@pytest.mark.slow
 class TestAuthenticatorIntegration:
     """Integration tests for authenticator."""
     
-    @pytest.fixture
-    def mock_config(self):
-        """Create a mock configuration."""
-        config = Mock(spec=Config)
-        config.youtube_client_id = "test_client_id"
-        config.youtube_client_secret = "test_client_secret"
-        config.youtube_scopes = ["https://www.googleapis.com/auth/youtube.readonly"]
-        return config
+    @pytest.fixture(autouse=True)
+    def _patch_get_config(self, monkeypatch, mock_config):
+        """Serve the shared mock configuration to every authenticator."""
+        monkeypatch.setattr(youtube_auth, 'get_config', lambda: mock_config)
     
     def test_full_authentication_flow(self, mock_config):
         """Test complete authentication flow."""
-        with patch('src.auth.youtube_auth.get_config', return_value=mock_config):
-            authenticator = YouTubeAuthenticator()
-            
-            # Initially not authenticated
-            assert not authenticator.is_authenticated()
-            
-            # Mock successful authentication
-            with patch.object(authenticator, 'authenticate', return_value=True):
-                with patch.object(authenticator, 'is_authenticated', return_value=True):
-                    # Authenticate
-                    result = authenticator.authenticate()
-                    assert result is True
-                    
-                    # Should be authenticated now
-                    assert authenticator.is_authenticated()
+        authenticator = YouTubeAuthenticator()
+        
+        # Initially not authenticated
+        assert not authenticator.is_authenticated()
+        
+        # Complete the OAuth callback with a mocked token exchange
+        flow = Mock(credentials=Credentials(**_CREDENTIALS_DATA))
+        with patch.object(authenticator, '_create_oauth_flow', return_value=flow):
+            result = authenticator.handle_oauth_callback("auth_code")
+        assert result is True
+        
+        # Should be authenticated now
+        assert authenticator.is_authenticated()
     
-    def test_credential_persistence(self, mock_config):
+    def test_credential_persistence(self, mock_config, monkeypatch, tmp_path):
         """Test that credentials persist across instances."""
-        with patch('src.auth.youtube_auth.get_config', return_value=mock_config):
-            # Create first authenticator and save credentials
-            auth1 = YouTubeAuthenticator()
-            test_credentials = {"token": "test_token"}
-            auth1._save_credentials(test_credentials)
-            
-            # Create second authenticator and load credentials
-            auth2 = YouTubeAuthenticator()
-            loaded_credentials = auth2._load_credentials()
-            
-            assert loaded_credentials == test_credentials
-            
-            # Cleanup
-            if os.path.exists(auth1.token_file):
-                os.unlink(auth1.token_file)
+        # Persistence wiring only; encryption itself is covered separately
+        monkeypatch.setattr(YouTubeAuthenticator, '_encrypt_data',
+                            lambda self, data: json.dumps(data).encode())
+        monkeypatch.setattr(YouTubeAuthenticator, '_decrypt_data',
+                            lambda self, data: json.loads(data))
+        
+        token_file = tmp_path / "token.encrypted"
+        
+        # Create first authenticator and save credentials
+        auth1 = YouTubeAuthenticator()
+        auth1.token_file = token_file
+        auth1._save_credentials(Credentials(**_CREDENTIALS_DATA))
+        
+        # Create second authenticator and load credentials
+        auth2 = YouTubeAuthenticator()
+        auth2.token_file = token_file
+        loaded_credentials = auth2._load_credentials()
+        
+        assert loaded_credentials.token == _CREDENTIALS_DATA["token"]
+        assert loaded_credentials.refresh_token == _CREDENTIALS_DATA["refresh_token"]
 
 def test_get_authenticator():
     """Test the get_authenticator function."""
-    from src.auth.youtube_auth import get_authenticator
-    
     # Should return the same instance (singleton pattern)
     auth1 = get_authenticator()
     auth2 = get_authenticator()
@@ -4,38 +4,93 @@ Unit tests for database models and operations
 """
 
 import pytest
-import tempfile
 import os
+from dataclasses import replace
 from datetime import datetime, date
-from unittest.mock import Mock, patch
-from pathlib import Path
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy import create_engine, event, func, insert, literal, select
+from sqlalchemy.orm import joinedload, scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
+import src.database.models as models
 from src.database.models import (
     Base, Video, VideoMetrics, ChannelMetrics, Insight, APIQuota,
     DatabaseManager, get_db_session
 )
-from src.utils.config import Config
+
+_DAY_1 = date(2024, 1, 1)
+_DAY_2 = date(2024, 1, 2)
+_PUBLISHED_AT = datetime(2024, 1, 1, 12, 0, 0)
+
+# One session factory for the module; each test binds it to its own connection
+_TestSession = scoped_session(sessionmaker(join_transaction_mode="create_savepoint"))
+
+@pytest.fixture(autouse=True)
+def _reset_db_manager(monkeypatch):
+    """Start every test without a global database manager and restore it afterwards."""
+    monkeypatch.setattr(models, "_db_manager", None)
+
+def _memory_db_path(name):
+    """Name a shared-cache in-memory database, keyed by the xdist worker."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    return f"file:{worker}_{name}?mode=memory&cache=shared&uri=true"
+
+def _enable_savepoints(engine):
+    """Let SQLAlchemy issue BEGIN itself; pysqlite's own handling breaks SAVEPOINT."""
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+def _rollback_session(engine):
+    """Yield a session whose changes are rolled back when the generator finishes.
+    
+    Commits inside the session only release a savepoint.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    
+    yield _TestSession(bind=connection)
+    
+    _TestSession.remove()
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture
+def temp_db_file(request):
+    """Name a shared-cache in-memory database private to this test."""
+    return _memory_db_path(request.node.name)
+
+@pytest.fixture
+def mock_config(mock_config, temp_db_file):
+    """Point the shared stub configuration at this test's database."""
+    return replace(mock_config, database_url=f"sqlite:///{temp_db_file}")
+
+@pytest.fixture(scope="session")
+def engine():
+    """Create one in-memory database with the schema for the whole session."""
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    _enable_savepoints(engine)
+    Base.metadata.create_all(engine)
+    
+    yield engine
+    
+    engine.dispose()
 
 class TestDatabaseModels:
     """Test cases for database models."""
     
     @pytest.fixture
-    def temp_db(self):
-        """Create a temporary in-memory database for testing."""
-        engine = create_engine("sqlite:///:memory:", echo=False)
-        Base.metadata.create_all(engine)
+    def temp_db(self, engine):
+        """Create a session whose changes are rolled back after each test.
         
-        Session = sessionmaker(bind=engine)
-        session = Session()
-        
-        yield session
-        
-        session.close()
+        Every test starts from the empty schema built once by the engine fixture.
+        """
+        yield from _rollback_session(engine)
     
     def test_video_model_creation(self, temp_db):
         """Test Video model creation and basic operations."""
@@ -44,14 +99,14 @@ class TestDatabaseModels:
             channel_id="test_channel_456",
             title="Test Video Title",
             description="Test video description",
-            published_at=datetime(2024, 1, 1, 12, 0, 0),
+            published_at=_PUBLISHED_AT,
             thumbnail_url="https://example.com/thumb.jpg",
             duration=300,
             tags=["test", "video"]
         )
         
         temp_db.add(video)
-        temp_db.commit()
+        temp_db.flush()
         
         # Retrieve and verify
         retrieved_video = temp_db.query(Video).filter_by(video_id="test_video_123").first()
@@ -64,7 +119,7 @@ class TestDatabaseModels:
         assert retrieved_video.duration == 300
         assert retrieved_video.tags == ["test", "video"]
     
-    def test_video_model_repr(self, temp_db):
+    def test_video_model_repr(self):
         """Test Video model string representation."""
         video = Video(
             video_id="test_video_123",
@@ -84,12 +139,12 @@ class TestDatabaseModels:
             title="Test Video"
         )
         temp_db.add(video)
-        temp_db.commit()
+        temp_db.flush()
         
         # Create metrics
         metrics = VideoMetrics(
             video_id="test_video_123",
-            date=date(2024, 1, 1),
+            date=_DAY_1,
             impressions=10000,
             impressions_ctr=0.05,
             views=500,
@@ -104,12 +159,14 @@ class TestDatabaseModels:
         )
         
         temp_db.add(metrics)
-        temp_db.commit()
+        temp_db.flush()
         
         # Retrieve and verify
-        retrieved_metrics = temp_db.query(VideoMetrics).filter_by(
+        retrieved_metrics = temp_db.query(VideoMetrics).options(
+            joinedload(VideoMetrics.video)
+        ).filter_by(
             video_id="test_video_123",
-            date=date(2024, 1, 1)
+            date=_DAY_1
         ).first()
         
         assert retrieved_metrics is not None
@@ -123,11 +180,11 @@ class TestDatabaseModels:
         assert retrieved_metrics.video == video
         assert video.metrics[0] == retrieved_metrics
     
-    def test_video_metrics_calculated_properties(self, temp_db):
+    def test_video_metrics_calculated_properties(self):
         """Test calculated properties in VideoMetrics."""
         metrics = VideoMetrics(
             video_id="test_video_123",
-            date=date(2024, 1, 1),
+            date=_DAY_1,
             views=1000,
             likes=50,
             comments=10,
@@ -149,7 +206,7 @@ class TestDatabaseModels:
         """Test ChannelMetrics model creation."""
         channel_metrics = ChannelMetrics(
             channel_id="test_channel_456",
-            date=date(2024, 1, 1),
+            date=_DAY_1,
             views=50000,
             impressions=200000,
             impressions_ctr=0.25,
@@ -160,12 +217,12 @@ class TestDatabaseModels:
         )
         
         temp_db.add(channel_metrics)
-        temp_db.commit()
+        temp_db.flush()
         
         # Retrieve and verify
         retrieved_metrics = temp_db.query(ChannelMetrics).filter_by(
             channel_id="test_channel_456",
-            date=date(2024, 1, 1)
+            date=_DAY_1
         ).first()
         
         assert retrieved_metrics is not None
@@ -192,7 +249,7 @@ class TestDatabaseModels:
         )
         
         temp_db.add(insight)
-        temp_db.commit()
+        temp_db.flush()
         
         # Retrieve and verify
         retrieved_insight = temp_db.query(Insight).filter_by(
@@ -217,7 +274,7 @@ class TestDatabaseModels:
         )
         
         temp_db.add(insight)
-        temp_db.commit()
+        temp_db.flush()
         
         # Retrieve and verify
         retrieved_insight = temp_db.query(Insight).filter_by(
@@ -231,17 +288,17 @@ class TestDatabaseModels:
     def test_api_quota_model_creation(self, temp_db):
         """Test APIQuota model creation."""
         quota = APIQuota(
-            date=date(2024, 1, 1),
+            date=_DAY_1,
             data_api_quota_used=5000,
             analytics_api_quota_used=100
         )
         
         temp_db.add(quota)
-        temp_db.commit()
+        temp_db.flush()
         
         # Retrieve and verify
         retrieved_quota = temp_db.query(APIQuota).filter_by(
-            date=date(2024, 1, 1)
+            date=_DAY_1
         ).first()
         
         assert retrieved_quota is not None
@@ -256,20 +313,18 @@ class TestDatabaseModels:
             channel_id="test_channel_456",
             title="Test Video"
         )
-        temp_db.add(video)
         
         # Create metrics
         metrics1 = VideoMetrics(
             video_id="test_video_123",
-            date=date(2024, 1, 1),
+            date=_DAY_1,
             views=1000
         )
         metrics2 = VideoMetrics(
             video_id="test_video_123",
-            date=date(2024, 1, 2),
+            date=_DAY_2,
             views=1500
         )
-        temp_db.add_all([metrics1, metrics2])
         
         # Create insights
         insight1 = Insight(
@@ -286,12 +341,15 @@ class TestDatabaseModels:
             confidence=0.6,
             rationale="Test insight 2"
         )
-        temp_db.add_all([insight1, insight2])
         
-        temp_db.commit()
+        temp_db.add_all([video, metrics1, metrics2, insight1, insight2])
+        temp_db.flush()
         
         # Test relationships
-        retrieved_video = temp_db.query(Video).filter_by(video_id="test_video_123").first()
+        retrieved_video = temp_db.query(Video).options(
+            joinedload(Video.metrics),
+            joinedload(Video.insights)
+        ).filter_by(video_id="test_video_123").first()
         
         assert len(retrieved_video.metrics) == 2
         assert len(retrieved_video.insights) == 2
@@ -303,25 +361,6 @@ class TestDatabaseModels:
 class TestDatabaseManager:
     """Test cases for DatabaseManager class."""
     
-    @pytest.fixture
-    def temp_db_file(self):
-        """Create a temporary database file."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            temp_file = f.name
-        
-        yield temp_file
-        
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
-    
-    @pytest.fixture
-    def mock_config(self, temp_db_file):
-        """Create a mock configuration with temporary database."""
-        config = Mock(spec=Config)
-        config.database_url = f"sqlite:///{temp_db_file}"
-        return config
-    
     def test_database_manager_init(self, mock_config):
         """Test DatabaseManager initialization."""
         with patch('src.database.models.get_config', return_value=mock_config):
@@ -375,10 +414,6 @@ class TestDatabaseManager:
     def test_database_manager_singleton(self, mock_config):
         """Test that DatabaseManager behaves as singleton."""
         with patch('src.database.models.get_config', return_value=mock_config):
-            # Clear any existing instance
-            import src.database.models
-            src.database.models._db_manager = None
-            
             manager1 = DatabaseManager()
             manager2 = DatabaseManager()
             
@@ -388,26 +423,15 @@ class TestDatabaseManager:
 class TestDatabaseUtilities:
     """Test database utility functions."""
     
-    @pytest.fixture
-    def mock_config(self):
-        """Create a mock configuration."""
-        config = Mock(spec=Config)
-        config.database_url = "sqlite:///:memory:"
-        return config
-    
     def test_get_db_session(self, mock_config):
         """Test get_db_session function."""
         with patch('src.database.models.get_config', return_value=mock_config):
-            # Clear any existing instance
-            import src.database.models
-            src.database.models._db_manager = None
-            
             session = get_db_session()
             
             assert session is not None
             
             # Should be able to perform basic operations
-            result = session.execute("SELECT 1").scalar()
+            result = session.execute(select(literal(1))).scalar()
             assert result == 1
             
             session.close()
@@ -415,164 +439,143 @@ class TestDatabaseUtilities:
 class TestDatabaseIntegration:
     """Integration tests for database operations."""
     
-    @pytest.fixture
-    def temp_db_file(self):
-        """Create a temporary database file."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            temp_file = f.name
+    @pytest.fixture(scope="class")
+    def db_manager(self, request):
+        """Create one database manager and schema shared by the class's tests."""
+        config = SimpleNamespace(database_url=f"sqlite:///{_memory_db_path(request.cls.__name__)}")
         
-        yield temp_file
+        with patch('src.database.models.get_config', return_value=config):
+            db_manager = DatabaseManager()
+            _enable_savepoints(db_manager.engine)
+            db_manager.create_tables()
+            
+            yield db_manager
         
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
+        db_manager.close()
     
     @pytest.fixture
-    def mock_config(self, temp_db_file):
-        """Create a mock configuration with temporary database."""
-        config = Mock(spec=Config)
-        config.database_url = f"sqlite:///{temp_db_file}"
-        return config
+    def session(self, db_manager):
+        """Open a session on the shared database and roll back what the test wrote."""
+        yield from _rollback_session(db_manager.engine)
     
-    def test_full_data_workflow(self, mock_config):
+    def test_full_data_workflow(self, session):
         """Test complete data workflow from creation to retrieval."""
-        with patch('src.database.models.get_config', return_value=mock_config):
-            # Clear any existing instance
-            import src.database.models
-            src.database.models._db_manager = None
-            
-            # Initialize database
-            db_manager = DatabaseManager()
-            db_manager.create_tables()
-            
-            session = get_db_session()
-            
-            try:
-                # Create video
-                video = Video(
-                    video_id="integration_test_video",
-                    channel_id="integration_test_channel",
-                    title="Integration Test Video",
-                    description="Test description",
-                    published_at=datetime(2024, 1, 1),
-                    duration=300
-                )
-                session.add(video)
-                
-                # Create metrics for multiple days
-                for day in range(1, 8):  # 7 days of data
-                    metrics = VideoMetrics(
-                        video_id="integration_test_video",
-                        date=date(2024, 1, day),
-                        impressions=1000 * day,
-                        views=100 * day,
-                        likes=10 * day,
-                        comments=2 * day
-                    )
-                    session.add(metrics)
-                
-                # Create insights
-                insight = Insight(
-                    video_id="integration_test_video",
-                    insight_type="video",
-                    priority="high",
-                    confidence=0.9,
-                    rationale="Integration test insight",
-                    payload_json={"test": "data"}
-                )
-                session.add(insight)
-                
-                # Create channel metrics
-                channel_metrics = ChannelMetrics(
-                    channel_id="integration_test_channel",
-                    date=date(2024, 1, 1),
-                    views=10000,
-                    subscribers_gained=50
-                )
-                session.add(channel_metrics)
-                
-                # Create API quota record
-                quota = APIQuota(
-                    date=date(2024, 1, 1),
-                    data_api_quota_used=1000,
-                    analytics_api_quota_used=50
-                )
-                session.add(quota)
-                
-                session.commit()
-                
-                # Verify data was saved correctly
-                saved_video = session.query(Video).filter_by(
-                    video_id="integration_test_video"
-                ).first()
-                
-                assert saved_video is not None
-                assert len(saved_video.metrics) == 7
-                assert len(saved_video.insights) == 1
-                
-                # Test aggregations
-                total_views = sum(m.views for m in saved_video.metrics)
-                assert total_views == sum(100 * day for day in range(1, 8))
-                
-                # Test relationships
-                first_metrics = saved_video.metrics[0]
-                assert first_metrics.video == saved_video
-                
-                first_insight = saved_video.insights[0]
-                assert first_insight.video == saved_video
-                assert first_insight.payload_json == {"test": "data"}
-                
-            finally:
-                session.close()
+        # Create video
+        video = Video(
+            video_id="integration_test_video",
+            channel_id="integration_test_channel",
+            title="Integration Test Video",
+            description="Test description",
+            published_at=datetime(2024, 1, 1),
+            duration=300
+        )
+        session.add(video)
+        # Write the parent row before the bulk insert
+        session.flush()
+        
+        # Create metrics for multiple days in one bulk INSERT
+        session.execute(
+            insert(VideoMetrics),
+            [
+                {
+                    "video_id": "integration_test_video",
+                    "date": date(2024, 1, day),
+                    "impressions": 1000 * day,
+                    "views": 100 * day,
+                    "likes": 10 * day,
+                    "comments": 2 * day
+                }
+                for day in range(1, 8)  # 7 days of data
+            ]
+        )
+        
+        # Create insights
+        insight = Insight(
+            video_id="integration_test_video",
+            insight_type="video",
+            priority="high",
+            confidence=0.9,
+            rationale="Integration test insight",
+            payload_json={"test": "data"}
+        )
+        session.add(insight)
+        
+        # Create channel metrics
+        channel_metrics = ChannelMetrics(
+            channel_id="integration_test_channel",
+            date=_DAY_1,
+            views=10000,
+            subscribers_gained=50
+        )
+        session.add(channel_metrics)
+        
+        # Create API quota record
+        quota = APIQuota(
+            date=_DAY_1,
+            data_api_quota_used=1000,
+            analytics_api_quota_used=50
+        )
+        session.add(quota)
+        
+        session.commit()
+        
+        # Verify data was saved correctly
+        saved_video = session.query(Video).filter_by(
+            video_id="integration_test_video"
+        ).first()
+        
+        assert saved_video is not None
+        assert len(saved_video.metrics) == 7
+        assert len(saved_video.insights) == 1
+        
+        # Test aggregations
+        total_views = session.query(func.sum(VideoMetrics.views)).filter(
+            VideoMetrics.video_id == "integration_test_video"
+        ).scalar()
+        assert total_views == sum(100 * day for day in range(1, 8))
+        
+        # Test relationships
+        first_metrics = saved_video.metrics[0]
+        assert first_metrics.video == saved_video
+        
+        first_insight = saved_video.insights[0]
+        assert first_insight.video == saved_video
+        assert first_insight.payload_json == {"test": "data"}
     
-    def test_constraint_violations(self, mock_config):
+    def test_constraint_violations(self, session):
         """Test database constraint violations."""
-        with patch('src.database.models.get_config', return_value=mock_config):
-            # Clear any existing instance
-            import src.database.models
-            src.database.models._db_manager = None
-            
-            db_manager = DatabaseManager()
-            db_manager.create_tables()
-            
-            session = get_db_session()
-            
-            try:
-                # Create video
-                video = Video(
-                    video_id="constraint_test_video",
-                    channel_id="constraint_test_channel",
-                    title="Constraint Test"
-                )
-                session.add(video)
-                session.commit()
-                
-                # Try to create duplicate video (should fail)
-                duplicate_video = Video(
-                    video_id="constraint_test_video",
-                    channel_id="different_channel",
-                    title="Duplicate Video"
-                )
-                session.add(duplicate_video)
-                
-                with pytest.raises(Exception):  # Should raise integrity error
-                    session.commit()
-                
-                session.rollback()
-                
-                # Try to create metrics for non-existent video
-                invalid_metrics = VideoMetrics(
-                    video_id="non_existent_video",
-                    date=date(2024, 1, 1),
-                    views=100
-                )
-                session.add(invalid_metrics)
-                
-                with pytest.raises(Exception):  # Should raise foreign key error
-                    session.commit()
-                
-            finally:
-                session.close()
+        # Create video
+        video = Video(
+            video_id="constraint_test_video",
+            channel_id="constraint_test_channel",
+            title="Constraint Test"
+        )
+        session.add(video)
+        session.commit()
+        
+        # Try to create duplicate video (should fail)
+        duplicate_video = Video(
+            video_id="constraint_test_video",
+            channel_id="different_channel",
+            title="Duplicate Video"
+        )
+        session.add(duplicate_video)
+        
+        with pytest.raises(Exception):  # Should raise integrity error
+            session.commit()
+        
+        session.rollback()
+        
+        # Try to create metrics for non-existent video
+        invalid_metrics = VideoMetrics(
+            video_id="non_existent_video",
+            date=_DAY_1,
+            views=100
+        )
+        session.add(invalid_metrics)
+        
+        with pytest.raises(Exception):  # Should raise foreign key error
+            session.commit()
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the Gemini prompt and response paths
+
+Run with: pytest tests/test_gemini_benchmark.py --slow
+"""
+
+import pytest
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+pytest.importorskip("pytest_benchmark")
+
+from src.ai.gemini_client import GeminiClient, GeminiPromptTemplates, _CHANNEL_VALIDATOR
+from tests.helpers import GenResponse
+
+pytestmark = pytest.mark.slow
+
+_CHANNEL_DATA = {
+    "channel_id": "test_channel_123",
+    "date_range": "2024-01-01 to 2024-01-31",
+    "impressions": 100000,
+    "views": 50000,
+    "ctr": 0.05,
+    "avg_view_duration_sec": 120,
+    "subs_change": 50,
+    "top_videos": [
+        {"video_id": f"video_{i}", "title": f"Video {i}", "views": 1000 * i}
+        for i in range(10)
+    ]
+}
+
+_CHANNEL_INSIGHT_JSON = json.dumps([
+    {
+        "action_type": "adjust_upload_schedule",
+        "priority": "high",
+        "confidence": 0.85,
+        "rationale": "Uploads cluster on weekdays with the lowest viewer activity.",
+        "recommended_videos": ["video_1", "video_2"],
+        "details": {"suggested_days": ["Saturday", "Sunday"]}
+    }
+])
+
+@pytest.fixture(scope="module")
+def gemini_client():
+    """Build one GeminiClient whose model returns a canned channel response."""
+    # Rate limit high enough that benchmark rounds never wait
+    config = SimpleNamespace(gemini_api_key="test_api_key_123", gemini_api_rate_limit=10**9)
+    with patch('src.ai.gemini_client.genai') as mock_genai:
+        mock_model = Mock()
+        mock_model.generate_content.return_value = GenResponse(text=_CHANNEL_INSIGHT_JSON)
+        mock_genai.GenerativeModel.return_value = mock_model
+        yield GeminiClient(config)
+
+def test_bench_channel_prompt(benchmark):
+    """Benchmark formatting the channel prompt."""
+    prompt = benchmark(GeminiPromptTemplates.format_channel_prompt, _CHANNEL_DATA)
+    assert "test_channel_123" in prompt
+
+def test_bench_validate_channel_response(benchmark, gemini_client):
+    """Benchmark parsing and schema-validating a channel response."""
+    parsed = benchmark(
+        gemini_client._validate_response,
+        _CHANNEL_INSIGHT_JSON,
+        _CHANNEL_VALIDATOR
+    )
+    assert parsed[0]["action_type"] == "adjust_upload_schedule"
+
+def test_bench_generate_channel_insights(benchmark, gemini_client):
+    """Benchmark the full channel insights path with the model mocked."""
+    result = benchmark(gemini_client.generate_channel_insights, _CHANNEL_DATA)
+    assert result.success
+    assert len(result.insights) == 1
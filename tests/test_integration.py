@@ -25,19 +25,12 @@ class TestEndToEndWorkflow:
     """Test complete end-to-end workflows."""
     
     @pytest.fixture
-    def temp_db(self):
+    def temp_db(self, tmp_path):
         """Create temporary database for testing."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-        
-        # Set up database
-        db_manager = DatabaseManager(f"sqlite:///{db_path}")
+        db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
         db_manager.create_tables()
         
-        yield db_manager
-        
-        # Cleanup
-        os.unlink(db_path)
+        return db_manager
     
     @pytest.fixture
     def mock_youtube_service(self):
@@ -493,24 +486,18 @@ class TestModuleInteractions:
                     mock_service = Mock()
                     mock_build.return_value = mock_service
                     
-                    # Create temporary database
-                    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-                        db_path = f.name
+                    # Create temporary database next to the credentials
+                    db_path = os.path.join(temp_dir, "test.db")
+                    db_manager = DatabaseManager(f"sqlite:///{db_path}")
+                    db_manager.create_tables()
+                    
+                    ingester = YouTubeDataIngester(
+                        credentials_path=credentials_path,
+                        db_manager=db_manager
+                    )
                     
-                    try:
-                        db_manager = DatabaseManager(f"sqlite:///{db_path}")
-                        db_manager.create_tables()
-                        
-                        ingester = YouTubeDataIngester(
-                            credentials_path=credentials_path,
-                            db_manager=db_manager
-                        )
-                        
-                        # Verify ingester was created successfully
-                        assert ingester is not None
-                        
-                    finally:
-                        os.unlink(db_path)
+                    # Verify ingester was created successfully
+                    assert ingester is not None
     
     def test_ingestion_and_ai_integration(self, temp_db):
         """Test integration between data ingestion and AI insights."""
@@ -645,59 +632,53 @@ class TestModuleInteractions:
 class TestErrorRecovery:
     """Test error recovery and resilience."""
     
-    def test_database_connection_recovery(self):
+    def test_database_connection_recovery(self, tmp_path):
         """Test database connection recovery after failure."""
         # Create database that will be "corrupted"
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
+        db_path = tmp_path / "test.db"
         
-        try:
-            # Create initial database
-            db_manager = DatabaseManager(f"sqlite:///{db_path}")
-            db_manager.create_tables()
-            
-            # Add some data
-            with db_manager.get_session() as session:
-                video = Video(
-                    video_id="test_video",
-                    channel_id="test_channel",
-                    title="Test Video",
-                    description="Test description",
-                    published_at=datetime(2024, 1, 1),
-                    thumbnail_url="http://example.com/thumb.jpg"
-                )
-                session.add(video)
-                session.commit()
-            
-            # Simulate database corruption by deleting file
-            os.unlink(db_path)
-            
-            # Try to recreate database
-            db_manager2 = DatabaseManager(f"sqlite:///{db_path}")
-            db_manager2.create_tables()
-            
-            # Should be able to add data to new database
-            with db_manager2.get_session() as session:
-                video2 = Video(
-                    video_id="test_video_2",
-                    channel_id="test_channel",
-                    title="Test Video 2",
-                    description="Test description",
-                    published_at=datetime(2024, 1, 2),
-                    thumbnail_url="http://example.com/thumb2.jpg"
-                )
-                session.add(video2)
-                session.commit()
-            
-            # Verify recovery
-            with db_manager2.get_session() as session:
-                videos = session.query(Video).all()
-                assert len(videos) == 1
-                assert videos[0].video_id == "test_video_2"
+        # Create initial database
+        db_manager = DatabaseManager(f"sqlite:///{db_path}")
+        db_manager.create_tables()
+        
+        # Add some data
+        with db_manager.get_session() as session:
+            video = Video(
+                video_id="test_video",
+                channel_id="test_channel",
+                title="Test Video",
+                description="Test description",
+                published_at=datetime(2024, 1, 1),
+                thumbnail_url="http://example.com/thumb.jpg"
+            )
+            session.add(video)
+            session.commit()
+        
+        # Simulate database corruption by deleting file
+        db_path.unlink()
+        
+        # Try to recreate database
+        db_manager2 = DatabaseManager(f"sqlite:///{db_path}")
+        db_manager2.create_tables()
+        
+        # Should be able to add data to new database
+        with db_manager2.get_session() as session:
+            video2 = Video(
+                video_id="test_video_2",
+                channel_id="test_channel",
+                title="Test Video 2",
+                description="Test description",
+                published_at=datetime(2024, 1, 2),
+                thumbnail_url="http://example.com/thumb2.jpg"
+            )
+            session.add(video2)
+            session.commit()
         
-        finally:
-            if os.path.exists(db_path):
-                os.unlink(db_path)
+        # Verify recovery
+        with db_manager2.get_session() as session:
+            videos = session.query(Video).all()
+            assert len(videos) == 1
+            assert videos[0].video_id == "test_video_2"
     
     def test_api_failure_recovery(self):
         """Test recovery from API failures."""
@@ -15,9 +15,10 @@ from threading import Thread
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.utils import optimization
 from src.utils.optimization import (
-    MemoryCache, FileCache, RateLimiter, GlobalRateLimiters,
-    TaskScheduler, cache_result, rate_limit
+    MemoryCache, FileCache, SqliteCache, RateLimiter, GlobalRateLimiters,
+    TaskScheduler
 )
 
 class TestMemoryCache:
@@ -133,6 +134,25 @@ class TestMemoryCache:
         
         cache.delete("key1")
         assert cache.size == 1
+    
+    def test_memory_cache_key_distinguishes_equal_values_of_different_types(self):
+        """Test 1, True and 1.0 don't share a cache entry."""
+        calls = []
+        
+        @optimization.cached(ttl=60)
+        def identity(value, flag=None):
+            calls.append(value)
+            return (type(value), type(flag))
+        
+        with patch.object(optimization, 'get_memory_cache', return_value=MemoryCache()):
+            assert identity(1) == (int, type(None))
+            assert identity(True) == (bool, type(None))
+            assert identity(1.0) == (float, type(None))
+            assert identity(1, flag=1) == (int, int)
+            assert identity(1, flag=True) == (int, bool)
+            assert identity(1) == (int, type(None))
+        
+        assert calls == [1, True, 1.0, 1, 1]
 
 class TestFileCache:
     """Test cases for FileCache class."""
@@ -753,5 +773,62 @@ class TestPerformance:
         # Should complete in reasonable time
         assert (end_time - start_time) < 0.5
 
+class TestCacheFactories:
+    """Test cases for the global cache getters."""
+    
+    @pytest.fixture
+    def factory_config(self, tmp_path, monkeypatch):
+        """Run in a temp directory with fresh globals and a stub config."""
+        config = Mock(cache_ttl_seconds=120, cache_backend='file')
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(optimization, 'get_config', lambda: config)
+        monkeypatch.setattr(optimization, '_memory_cache', None)
+        monkeypatch.setattr(optimization, '_file_cache', None)
+        return config
+    
+    def test_get_memory_cache_uses_config_ttl(self, factory_config):
+        """Test the memory cache picks up the configured TTL."""
+        cache = optimization.get_memory_cache()
+        assert isinstance(cache, MemoryCache)
+        assert cache.default_ttl == 120
+        assert optimization.get_memory_cache() is cache
+    
+    @pytest.mark.parametrize("backend,cache_class", [
+        ('file', FileCache),
+        ('sqlite', SqliteCache),
+    ])
+    def test_get_file_cache_backend(self, factory_config, backend, cache_class):
+        """Test the persistent cache honours the configured backend and TTL."""
+        factory_config.cache_backend = backend
+        cache = optimization.get_file_cache()
+        assert isinstance(cache, cache_class)
+        assert cache.default_ttl == 120
+        
+        cache.set("key1", {"data": "value1"})
+        assert cache.get("key1") == {"data": "value1"}
+    
+    def test_cached_resolves_cache_on_first_call(self, factory_config, monkeypatch):
+        """Test decorating a function does not read the config."""
+        get_config = Mock(return_value=factory_config)
+        monkeypatch.setattr(optimization, 'get_config', get_config)
+        
+        @optimization.cached(ttl=60)
+        def double(x):
+            return x * 2
+        
+        get_config.assert_not_called()
+        assert double(2) == 4
+        get_config.assert_called_once()
+    
+    def test_global_rate_limiters_use_config(self, factory_config):
+        """Test the API limiters are sized from the config."""
+        factory_config.youtube_api_quota_limit = 5000
+        factory_config.gemini_api_rate_limit = 30
+        limiters = GlobalRateLimiters()
+        assert limiters.youtube_data.requests_per_window == 5000
+        assert limiters.youtube_data.window_seconds == 86400
+        assert limiters.gemini.requests_per_window == 30
+        assert limiters.gemini.window_seconds == 60
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file